@@ -0,0 +1,180 @@
+# abstraction.py
+
+import os
+import sys
+
+import numpy as np
+
+from game.cards import deal_batch_rows, make_rng
+from game.evaluator import evaluate_batch
+from game.isomorphism import indexers, canonical_index, canonical_index_batch
+import game.config as cg
+
+# Card abstraction
+#
+# Every canonical hand/board (game.isomorphism) of a street is mapped to one of a configurable number
+# of buckets. build_index() runs offline (`python -m game.abstraction flop 50`):
+#   1. Features: for each canonical class, the distribution of its equity against a random hand once
+#      the next street is dealt, as a histogram over equity bins. On the river there is no next
+#      street and the feature is the equity itself.
+#   2. Buckets: k-means over the features, with buckets renumbered from weakest to strongest
+#      expected equity.
+# The result is a uint16 array over the street's canonical indices, saved as
+# abstraction_<street>.npy in config.table_dir and memory-mapped on first use, so a lookup is one
+# canonical index and one array access.
+
+street_names = {0: "preflop", 3: "flop", 4: "turn", 5: "river"}
+
+# Cards dealt on the next street, by current board size
+next_street_cards = {0: 3, 3: 1, 4: 1}
+
+equity_bins = 10
+
+# Default (next-street samples, rollouts per sample) by board size. Pre-flop only has 169 classes
+# and can afford far more; the river has no next street.
+feature_samples = {0: (64, 256), 3: (16, 32), 4: (16, 32), 5: (1, 64)}
+
+def street_features(board_size, indices, rng=None, next_samples=None, rollouts=None):
+    '''
+    Equity features of the canonical classes indices of a street, as a (N, equity_bins) float32
+    histogram (a (N, 1) equity on the river).
+
+    Each class is dealt next_samples next-street cards and each of those is rolled out rollouts
+    times against a random hand to estimate its equity.
+    '''
+    rng = make_rng(rng)
+    next_samples = next_samples or feature_samples[board_size][0]
+    rollouts = rollouts or feature_samples[board_size][1]
+    known = indexers[board_size].unindex_batch(indices)
+    n = len(known)
+
+    if board_size == 5:
+        next_samples, outcomes = 1, known
+    else:
+        outcomes = np.repeat(known, next_samples, axis=0)
+        outcomes = np.hstack([outcomes, deal_batch_rows(outcomes, next_street_cards[board_size], rng)])
+
+    # Rest of the board plus the opponent's hand for every rollout
+    rows = np.repeat(outcomes, rollouts, axis=0)
+    dealt = deal_batch_rows(rows, 7 - rows.shape[1] + 2, rng)
+    opponent, board = dealt[:, :2], np.hstack([rows[:, 2:], dealt[:, 2:]])
+
+    hero, _ = evaluate_batch(np.hstack([rows[:, :2], board]))
+    villain, _ = evaluate_batch(np.hstack([opponent, board]))
+    share = (hero > villain) + 0.5 * (hero == villain)
+    equity = share.reshape(n, next_samples, rollouts).mean(axis=2)
+
+    if board_size == 5:
+        return equity.astype(np.float32)
+    bins = np.minimum((equity * equity_bins).astype(np.intp), equity_bins - 1)
+    histogram = np.zeros((n, equity_bins), dtype=np.float32)
+    np.add.at(histogram, (np.repeat(np.arange(n), next_samples), bins.ravel()), 1.0 / next_samples)
+    return histogram
+
+def _distances(features, centers):
+    return (features * features).sum(axis=1)[:, None] - 2 * features @ centers.T + (centers * centers).sum(axis=1)
+
+def assign(features, centers, chunk=200_000):
+    '''
+    Index of the nearest center for each feature row.
+    '''
+    labels = np.empty(len(features), dtype=np.intp)
+    for start in range(0, len(features), chunk):
+        labels[start:start + chunk] = _distances(features[start:start + chunk], centers).argmin(axis=1)
+    return labels
+
+def kmeans(features, k, rng=None, iterations=25, sample=200_000):
+    '''
+    Lloyd's k-means with k-means++ seeding, fitted on at most sample rows. Returns the (k, d) centers.
+    '''
+    rng = make_rng(rng)
+    if len(features) > sample:
+        features = features[rng.choice(len(features), sample, replace=False)]
+    features = np.asarray(features, dtype=np.float64)
+    k = min(k, len(features))
+
+    centers = features[[rng.integers(len(features))]]
+    closest = _distances(features, centers)[:, 0]
+    for _ in range(1, k):
+        weights = np.maximum(closest, 0)
+        pick = rng.choice(len(features), p=weights / weights.sum()) if weights.sum() > 0 else rng.integers(len(features))
+        centers = np.vstack([centers, features[pick]])
+        closest = np.minimum(closest, _distances(features, features[[pick]])[:, 0])
+
+    for _ in range(iterations):
+        labels = assign(features, centers)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, features)
+        moved = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        if np.allclose(moved, centers):
+            break
+        centers = moved
+    return centers
+
+def build_index(board_size, buckets, seed=0, chunk=50_000, **feature_args):
+    '''
+    Computes the bucket of every canonical class of a street. Returns a uint16 array indexed by
+    canonical index, with bucket 0 the weakest.
+    '''
+    rng = make_rng(seed)
+    size = indexers[board_size].size
+    width = 1 if board_size == 5 else equity_bins
+
+    features = np.empty((size, width), dtype=np.float32)
+    for start in range(0, size, chunk):
+        indices = np.arange(start, min(start + chunk, size))
+        features[start:start + len(indices)] = street_features(board_size, indices, rng, **feature_args)
+
+    centers = kmeans(features, buckets, rng)
+
+    # Renumber buckets by the expected equity of their center
+    strength = centers[:, 0] if width == 1 else centers @ ((np.arange(equity_bins) + 0.5) / equity_bins)
+    order = np.empty(len(centers), dtype=np.intp)
+    order[np.argsort(strength)] = np.arange(len(centers))
+    return order[assign(features, centers)].astype(np.uint16)
+
+def index_path(board_size, table_dir=cg.table_dir):
+    return os.path.join(table_dir, f"abstraction_{street_names[board_size]}.npy")
+
+def save_index(board_size, index, table_dir=cg.table_dir):
+    os.makedirs(table_dir, exist_ok=True)
+    np.save(index_path(board_size, table_dir), index)
+
+def load_index(board_size, table_dir=cg.table_dir):
+    '''
+    Memory-maps the bucket index of a street. Indices are built offline, see build_index().
+    '''
+    path = index_path(board_size, table_dir)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No {street_names[board_size]} bucket index at {path}, "
+                                f"build it with `python -m game.abstraction {street_names[board_size]} <buckets>`")
+    return np.load(path, mmap_mode='r')
+
+# Loaded lazily, one per street
+bucket_indices = {}
+
+def bucket(hole_cards, board=()):
+    '''
+    Bucket of hole cards and board on the current street.
+    '''
+    index = bucket_indices.get(len(board))
+    if index is None:
+        index = bucket_indices[len(board)] = load_index(len(board))
+    return int(index[canonical_index(hole_cards, board)])
+
+def bucket_batch(hole_cards, board=None):
+    '''
+    Vectorized bucket: hole_cards is (N, 2) and board is (N, 0/3/4/5) or None.
+    '''
+    board_size = 0 if board is None else np.shape(board)[1]
+    index = bucket_indices.get(board_size)
+    if index is None:
+        index = bucket_indices[board_size] = load_index(board_size)
+    return index[canonical_index_batch(hole_cards, board)]
+
+if __name__ == "__main__":
+    # Build step: python -m game.abstraction <street> [buckets]
+    street = {name: size for size, name in street_names.items()}[sys.argv[1]]
+    buckets = int(sys.argv[2]) if len(sys.argv) > 2 else cg.abstraction_buckets[sys.argv[1]]
+    save_index(street, build_index(street, buckets))
@@ -0,0 +1,223 @@
+# actions.py
+
+import numpy as np
+
+from game.cards import make_rng
+import game.config as cg
+
+# Action providers
+#
+# GameLogic asks the provider of the seat to act for every decision instead of calling input(), so
+# a table can be played by people, scripted policies or agents in any mix. A provider answers two
+# questions:
+#   action(game, player, highest_bet)     -> CHECK_CALL, BET_RAISE or FOLD
+#   bet_amount(game, player, highest_bet) -> chips to add to player.bet after BET_RAISE
+# A bet amount must bring player.bet to at least highest_bet and may not exceed player.chipcount.
+#
+# BetMenu turns this into a fixed set of discrete slots for agents and learners: fold, check/call,
+# then a raise of each configured size and all-in. For the seat to act it gives a legal-action mask
+# and the chip amount behind every slot, so a policy only ever picks a legal action.
+
+CHECK_CALL = '0'
+BET_RAISE = '1'
+FOLD = '2'
+
+actions = (CHECK_CALL, BET_RAISE, FOLD)
+
+class ActionProvider:
+    '''
+    Base class of action providers.
+    '''
+
+    def action(self, game, player, highest_bet):
+        raise NotImplementedError
+
+    def bet_amount(self, game, player, highest_bet):
+        raise NotImplementedError
+
+class HumanProvider(ActionProvider):
+    '''
+    Asks for every decision on the console and keeps asking until the answer is valid.
+    '''
+
+    def action(self, game, player, highest_bet):
+        while True:
+            action = input(f"{player.name}, choose your action (Check(0), Bet/Raise(1), Fold(2)): ")
+            if action in actions:
+                return action
+            print("Invalid action. Please choose a valid action.")
+
+    def bet_amount(self, game, player, highest_bet):
+        while True:
+            try:
+                bet_amount = int(input(f"{player.name}, enter your bet amount (current highest bet: {highest_bet}): "))
+            except ValueError:
+                print("Invalid input. Please enter a valid bet amount.")
+                continue
+            if bet_amount + player.bet >= highest_bet and bet_amount <= player.chipcount:
+                return bet_amount
+            print("Invalid bet amount. Please enter a valid amount within the allowed range.")
+
+class RandomProvider(ActionProvider):
+    '''
+    Picks check/call, bet/raise and fold with the given weights. A bet raises by one to three
+    big blinds over the call, capped at the player's chips.
+    '''
+
+    def __init__(self, rng=None, weights=(0.6, 0.3, 0.1)):
+        self.rng = make_rng(rng)
+        self.cumulative = [sum(weights[:i + 1]) / sum(weights) for i in range(len(weights))]
+
+    def action(self, game, player, highest_bet):
+        draw = self.rng.random()
+        action = next((action for action, edge in zip(actions, self.cumulative) if draw < edge), actions[-1])
+        # Without chips beyond the call there is nothing to raise with
+        if action == BET_RAISE and player.chipcount <= highest_bet - player.bet:
+            return CHECK_CALL
+        return action
+
+    def bet_amount(self, game, player, highest_bet):
+        raise_by = int(self.rng.integers(1, 4)) * cg.big_blind
+        return min(highest_bet - player.bet + raise_by, player.chipcount)
+
+class CallingProvider(ActionProvider):
+    '''
+    Always checks or calls.
+    '''
+
+    def action(self, game, player, highest_bet):
+        return CHECK_CALL
+
+    def bet_amount(self, game, player, highest_bet):
+        return min(highest_bet - player.bet, player.chipcount)
+
+class ScriptedProvider(ActionProvider):
+    '''
+    Plays a fixed sequence of decisions: each entry is CHECK_CALL, FOLD or (BET_RAISE, amount).
+    Raises IndexError when the script runs out.
+    '''
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.position = 0
+        self.amount = None
+
+    def action(self, game, player, highest_bet):
+        entry = self.script[self.position]
+        self.position += 1
+        if isinstance(entry, tuple):
+            entry, self.amount = entry
+        return entry
+
+    def bet_amount(self, game, player, highest_bet):
+        return self.amount
+
+class CallbackProvider(ActionProvider):
+    '''
+    Wraps a policy function policy(game, player, highest_bet) returning an action, or a
+    (BET_RAISE, amount) pair.
+    '''
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.amount = None
+
+    def action(self, game, player, highest_bet):
+        action = self.policy(game, player, highest_bet)
+        if isinstance(action, tuple):
+            action, self.amount = action
+        return action
+
+    def bet_amount(self, game, player, highest_bet):
+        return self.amount
+
+class BetMenu:
+    '''
+    Discrete action menu: slot 0 folds, slot 1 checks or calls, and the remaining slots raise by one
+    big blind over the call, by each fraction of the pot after calling, and all-in.
+
+    The one-big-blind slot is not a no-limit minimum raise (the call plus the last raise): the
+    engines accept any bet that reaches the highest bet, and the menu does not track raise sizes.
+
+    pot is every chip in the middle including the current bets, call the chips the seat needs to
+    call and chips its stack. A raise slot is legal when the seat has chips beyond the call and the
+    raise is short of all-in (the all-in slot covers bigger ones).
+    '''
+
+    fold_slot = 0
+    call_slot = 1
+
+    def __init__(self, pot_fractions=None, blind_raise=True, all_in=True):
+        self.pot_fractions = tuple(cg.bet_sizes if pot_fractions is None else pot_fractions)
+        self.blind_raise = blind_raise
+        self.all_in = all_in
+        self.labels = (["fold", "check/call"] + (["raise 1 bb"] if blind_raise else [])
+                       + [f"raise {fraction:g} pot" for fraction in self.pot_fractions] + (["all-in"] if all_in else []))
+        self.size = len(self.labels)
+
+    def options(self, pot, call, chips):
+        '''
+        Returns (mask, amounts) for one seat: which slots are legal and the chips each adds to the bet.
+        '''
+        call = min(call, chips)
+        raises = [call + cg.big_blind] if self.blind_raise else []
+        raises += [call + max(int(fraction * (pot + call)), cg.big_blind) for fraction in self.pot_fractions]
+
+        can_raise = chips > call
+        mask = [True, True] + [can_raise and amount < chips for amount in raises]
+        amounts = [0, call] + raises
+        if self.all_in:
+            mask.append(can_raise)
+            amounts.append(chips)
+        return mask, amounts
+
+    def options_batch(self, pot, call, chips):
+        '''
+        Vectorized options: pot, call and chips are (n,) arrays; returns (n, size) mask and amounts.
+        '''
+        pot, chips = np.asarray(pot, dtype=np.int64), np.asarray(chips, dtype=np.int64)
+        call = np.minimum(np.asarray(call, dtype=np.int64), chips)
+        columns = [np.zeros_like(call), call]
+        if self.blind_raise:
+            columns.append(call + cg.big_blind)
+        columns += [call + np.maximum((fraction * (pot + call)).astype(np.int64), cg.big_blind) for fraction in self.pot_fractions]
+        amounts = np.stack(columns, axis=1)
+
+        can_raise = chips > call
+        mask = np.ones(amounts.shape, dtype=bool)
+        mask[:, 2:] = can_raise[:, None] & (amounts[:, 2:] < chips[:, None])
+        if self.all_in:
+            amounts = np.hstack([amounts, chips[:, None]])
+            mask = np.hstack([mask, can_raise[:, None]])
+        return mask, amounts
+
+    def action(self, slot, amounts):
+        '''
+        Provider action (CHECK_CALL, FOLD or (BET_RAISE, amount)) of a slot.
+        '''
+        if slot == self.fold_slot:
+            return FOLD
+        if slot == self.call_slot:
+            return CHECK_CALL
+        return BET_RAISE, amounts[slot]
+
+class MenuProvider(ActionProvider):
+    '''
+    Plays a policy over the bet menu: policy(game, player, mask, amounts) returns a legal slot.
+    '''
+
+    def __init__(self, policy, menu=None):
+        self.policy = policy
+        self.menu = menu
+        self.amount = None
+
+    def action(self, game, player, highest_bet):
+        menu = self.menu or game.bet_menu
+        mask, amounts = game.legal_actions(player, menu)
+        action = menu.action(self.policy(game, player, mask, amounts), amounts)
+        if isinstance(action, tuple):
+            action, self.amount = action
+        return action
+
+    def bet_amount(self, game, player, highest_bet):
+        return self.amount
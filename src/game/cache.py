@@ -0,0 +1,67 @@
+# cache.py
+
+from collections import OrderedDict
+
+class LRUCache:
+    '''
+    Bounded mapping that evicts the least recently used entry once maxsize is reached.
+
+    Keeps hit, miss and eviction counters for monitoring. A maxsize of 0 disables the cache:
+    get() always misses and put() stores nothing.
+    '''
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        '''
+        Changes the size bound, evicting the oldest entries if the cache is now over it.
+        '''
+        self.maxsize = maxsize
+        while len(self.entries) > max(maxsize, 0):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        '''
+        Drops every entry and resets the counters.
+        '''
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self.entries)
@@ -1,71 +1,233 @@
 # cards.py
 
 import os
-import random
-import re
 
+import numpy as np
 from pokereval.card import Card  # Import the Card class from the pokereval library
 
+# Integer card encoding
+#
+# A card is an int from 0 to 51: card = (rank - 2) * 4 + (suit - 1)
+# Ranks run 2-14 (10-14 are ten through ace) and suits 1-4 (spades, hearts, diamonds, clubs),
+# following the pokereval Card conventions. Every conversion below is a single table lookup.
+
+rank_mapping = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, 'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
+suit_mapping = {'s': 1, 'h': 2, 'd': 3, 'c': 4}
+suit_names = {1: 'spades', 2: 'hearts', 3: 'diamonds', 4: 'clubs'}
+
+deck_size = 52
+
+card_rank = tuple(card // 4 + 2 for card in range(deck_size))
+card_suit = tuple(card % 4 + 1 for card in range(deck_size))
+
+# Bitmasks: bit (rank - 2) of a 13-bit rank mask and bit (suit - 1) of a 4-bit suit mask
+card_rank_bit = tuple(1 << (card // 4) for card in range(deck_size))
+card_suit_bit = tuple(1 << (card % 4) for card in range(deck_size))
+
+card_to_str = tuple((card_rank[card], suit_names[card_suit[card]]) for card in range(deck_size))
+card_to_num = tuple((card_rank[card], card_suit[card]) for card in range(deck_size))
+card_to_name = tuple(Card.RANK_TO_STRING[card_rank[card]] + Card.SUIT_TO_STRING[card_suit[card]] for card in range(deck_size))
+card_to_image = tuple(os.path.join("images", f"{card_rank[card]}_of_{suit_names[card_suit[card]]}.png") for card in range(deck_size))
+card_to_object = tuple(Card(card_rank[card], card_suit[card]) for card in range(deck_size))
+
+name_to_card = {name: card for card, name in enumerate(card_to_name)}
+
+def make_card(rank, suit):
+    '''
+    Returns the integer card for a rank (2-14) and suit (1-4).
+    '''
+    return (rank - 2) * 4 + (suit - 1)
+
+def card_from_name(name):
+    '''
+    Returns the integer card for a short name such as "As" or "Td".
+    '''
+    return name_to_card[name[0].upper() + name[1].lower()]
+
+def make_rng(seed=None):
+    '''
+    Returns a NumPy Generator.
+
+    Accepts None (fresh entropy), an int seed, a SeedSequence or an existing Generator,
+    which is returned unchanged so tables can share one stream.
+    '''
+    return np.random.default_rng(seed)
+
+def spawn_rngs(n, seed=None):
+    '''
+    Returns n independent, non-overlapping Generators spawned from one SeedSequence.
+
+    Use one per worker process or table; the same seed always gives the same streams.
+    '''
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed.spawn(n)]
+
+# Uniform draws fetched from the generator at a time when dealing
+draw_block = 16
+
+# Card order of a full deck, copied back into the deck's list on every reset
+deck_order = tuple(range(deck_size))
+
 class Deck:
-    ''' 
+    '''
     Representation of a Standard Deck
 
-    Contains a list of the cards in the deck
+    Contains a preallocated list of the cards in the deck as integers (0-51).
+    The deck is reused between hands: reset() copies the cards back into order in
+    place and moves the deal position back, and deal_card() draws a uniformly random
+    card from the undealt part of the list (one partial Fisher-Yates step), so only
+    the cards actually dealt are shuffled.
+
+    All randomness comes from the deck's own Generator (see make_rng). Since every
+    hand starts from the same card order, a deck reset with the generator in a given
+    state always deals the same cards.
 
     '''
 
-    def __init__(self):
-        self.cards = []
+    def __init__(self, rng=None):
+        self.cards = list(range(deck_size))
+        self.remaining = deck_size
+        self.rng = make_rng(rng)
+        self.draws = []
+        self.stacked = []
 
-        suits = Card(2,1).SUIT_TO_STRING
-        ranks = Card(2,1).RANK_TO_STRING
+    def reset(self):
+        '''
+        Returns every card to the deck, in order, without reallocating it
 
-        for suit in suits:
-            for rank in ranks:
-                _card = Card(rank, suit)
-                self.cards.append(_card)   
+        '''
+        self.cards[:] = deck_order
+        self.remaining = deck_size
+        self.draws = []
+        self.stacked = []
 
     def shuffle(self):
-        ''' 
+        '''
         Shuffles the deck
 
+        Cards are shuffled lazily as they are dealt, so this is a reset.
+
         '''
-        random.shuffle(self.cards)
+        self.reset()
 
     def deal_card(self):
-        ''' 
+        '''
         Deals a single card from the deck
 
         '''
-        return self.cards.pop()
-    
-def change_card_str(card):
-    '''
-    Converts Card object string representation for better display.
-    '''
+        cards = self.cards
+        last = self.remaining - 1
+        if last < 0:
+            raise IndexError("deal from empty deck")
+        if self.stacked:
+            j = cards.index(self.stacked.pop(), 0, last + 1)
+        else:
+            if not self.draws:
+                self.draws = self.rng.random(draw_block).tolist()
+            j = int(self.draws.pop() * (last + 1))
+        cards[j], cards[last] = cards[last], cards[j]
+        self.remaining = last
+        return cards[last]
+
+    def stack(self, cards):
+        '''
+        Makes the next deals come out as cards, in order, instead of at random
+        (e.g. to replay a recorded hand). reset() drops whatever is left of the stack.
+        '''
+        self.stacked = list(reversed(cards))
 
-    rank_mapping = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, 'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-    suit_mapping = {'s': 'spades', 'h': 'hearts', 'd': 'diamonds', 'c': 'clubs'}
+    def __len__(self):
+        return self.remaining
 
-    rank_match = re.findall(r'\((.*?)\)', str(card))[0][0]
-    suit_match = re.findall(r'\((.*?)\)', str(card))[0][1]
+# Batched dealing
 
-    rank = rank_mapping.get(rank_match, rank_match)
-    suit = suit_mapping.get(suit_match, suit_match)
+card_dtype = np.int8
 
-    return rank, suit
+def deal_batch(n, k, rng=None, dead=None):
+    '''
+    Deals k cards for each of n independent deals in one vectorized call.
 
-def change_card_num(card):
+    Runs k partial Fisher-Yates steps on all n decks at once and returns an (n, k)
+    array of integer cards. Cards listed in dead are removed from every deck first.
     '''
-    Converts Card object numerical representation for machine learning.
+    rng = make_rng(rng)
+    live = np.arange(deck_size, dtype=card_dtype)
+    if dead is not None and len(dead):
+        live = np.setdiff1d(live, np.asarray(dead, dtype=card_dtype))
+
+    size = len(live)
+    if k > size:
+        raise ValueError(f"cannot deal {k} cards from a deck of {size}")
+
+    decks = np.tile(live, (n, 1))
+    rows = np.arange(n)
+    draws = rng.random((n, k))
+    for i in range(k):
+        j = i + (draws[:, i] * (size - i)).astype(np.intp)
+        picked = decks[rows, j]
+        decks[rows, j] = decks[:, i]
+        decks[:, i] = picked
+
+    return decks[:, :k].copy()
+
+def deal_batch_rows(known, k, rng=None):
     '''
-    rank_mapping = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, 'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-    suit_mapping = {'s': 1, 'h': 2, 'd': 3, 'c': 4}
+    Deals k cards for each row of known, an (n, m) array of cards already out in that deal,
+    never dealing a row's own known cards. Returns an (n, k) array of integer cards.
 
-    rank_match = re.findall(r'\((.*?)\)', str(card))[0][0]
-    suit_match = re.findall(r'\((.*?)\)', str(card))[0][1]
+    Each row keeps a 52-bit mask of the cards out; a card is drawn from the whole deck and
+    only the rows that hit a card already out draw again.
+    '''
+    rng = make_rng(rng)
+    known = np.asarray(known, dtype=np.int64)
+    n = len(known)
+    used = np.bitwise_or.reduce(1 << known, axis=1) if known.shape[1] else np.zeros(n, dtype=np.int64)
+
+    cards = np.empty((n, k), dtype=card_dtype)
+    for i in range(k):
+        card = rng.integers(0, deck_size, n)
+        redo = np.flatnonzero(used >> card & 1)
+        while len(redo):
+            redraw = rng.integers(0, deck_size, len(redo))
+            card[redo] = redraw
+            redo = redo[(used[redo] >> redraw & 1).astype(bool)]
+        used |= 1 << card
+        cards[:, i] = card
+    return cards
+
+def deal_layout(players=2):
+    '''
+    Column indices of a deal_hands array, in the order GameLogic deals a hand:
+    hole cards round by round, then burn, flop, burn, turn, burn, river.
+
+    'hole' is a (players, 2) index array, so cards[:, layout['hole']] is (n, players, 2).
+    '''
+    start = 2 * players
+    return {
+        'hole': np.array([[seat, players + seat] for seat in range(players)]),
+        'burn': np.array([start, start + 4, start + 6]),
+        'flop': np.arange(start + 1, start + 4),
+        'turn': start + 5,
+        'river': start + 7,
+        'board': np.array([start + 1, start + 2, start + 3, start + 5, start + 7]),
+    }
+
+def deal_hands(n, players=2, rng=None, dead=None):
+    '''
+    Deals n complete hands (hole cards, burns, flop, turn, river) as an (n, 2 * players + 8)
+    array. Use deal_layout(players) to pick out the hole cards and board.
+    '''
+    return deal_batch(n, 2 * players + 8, rng, dead)
 
-    rank = rank_mapping.get(rank_match, rank_match)
-    suit = suit_mapping.get(suit_match, suit_match)
+def change_card_str(card):
+    '''
+    Converts an integer card to (rank, suit name) for better display.
+    '''
+    return card_to_str[card]
 
-    return [rank, suit]
+def change_card_num(card):
+    '''
+    Converts an integer card to (rank, suit) numerical representation for machine learning.
+    '''
+    return card_to_num[card]
@@ -1,5 +1,7 @@
 # Gameplay config
 
+import os
+
 # Blind settings
 small_blind = 1
 big_blind = 2
@@ -8,4 +10,16 @@ big_blind = 2
 chipcount = 4500
 
 # Agent settings
-agents = ["Agent 1", "Agent 2"]
\ No newline at end of file
+agents = ["Agent 1", "Agent 2"]
+
+# Lookup tables (hand evaluator, equity tables) are built once and cached here
+table_dir = os.path.join(os.path.dirname(__file__), "data")
+
+# Entries kept in the process-wide pre-flop hand_evaluation cache (0 disables it)
+evaluation_cache_size = 0
+
+# Default number of card abstraction buckets per street (see game.abstraction)
+abstraction_buckets = {"preflop": 20, "flop": 50, "turn": 50, "river": 50}
+
+# Raise sizes of the discrete bet menu, as fractions of the pot after calling (see game.actions.BetMenu)
+bet_sizes = (0.5, 1.0, 2.0)
@@ -0,0 +1,280 @@
+# equity.py
+
+import os
+import time
+from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from statistics import NormalDist
+
+import numpy as np
+
+from game.cards import deck_size, deal_batch
+from game.evaluator import evaluate_batch, card_state_keys, card_state_masks, state_ranks
+import game.table as tb
+
+# Monte Carlo equity
+#
+# Rollouts are dealt and scored in vectorized chunks (game.cards.deal_batch, game.evaluator.evaluate_batch).
+# A chunk returns the sums of the hero's pot share so the parent can keep a running mean and
+# confidence interval and stop as soon as the requested precision or time budget is reached.
+#
+# Exact equity
+#
+# With two or fewer cards to come, exact_equity enumerates every runout and opponent hand instead.
+# The board is summed into an additive evaluator state once, each runout extends it once, and every
+# opponent hand is a single add plus lookup on top (see game.evaluator.state_ranks).
+
+class EquityResult:
+    '''
+    Estimated share of the pot won by the hero, with win/tie rates and a confidence interval.
+    '''
+
+    def __init__(self, equity, win, tie, stderr, confidence, samples, elapsed):
+        self.equity = equity
+        self.win = win
+        self.tie = tie
+        self.stderr = stderr
+        self.confidence = confidence
+        self.samples = samples
+        self.elapsed = elapsed
+
+        if stderr > 0:
+            z = NormalDist().inv_cdf((1 + confidence) / 2)
+            self.low = max(0.0, equity - z * stderr)
+            self.high = min(1.0, equity + z * stderr)
+        else:
+            self.low = self.high = equity
+
+    def __repr__(self):
+        return f"EquityResult(equity={self.equity:.4f} [{self.low:.4f}, {self.high:.4f}], samples={self.samples})"
+
+def range_combos(weights, known):
+    '''
+    Converts a range {(card, card): weight} to (combos, probabilities) arrays,
+    dropping combos that use a known card. None is the uniform range over all hands.
+    '''
+    if weights is None:
+        weights = {(a, b): 1.0 for a in range(deck_size) for b in range(a + 1, deck_size)}
+
+    known = set(known)
+    combos = [combo for combo, weight in weights.items() if weight > 0 and not known.intersection(combo)]
+    if not combos:
+        raise ValueError("Range has no hands left once the known cards are removed")
+
+    probabilities = np.array([weights[combo] for combo in combos], dtype=np.float64)
+    return np.array(combos, dtype=np.int8), probabilities / probabilities.sum()
+
+def _deal_ranges(n, known, ranges, missing, rng):
+    '''
+    Deals opponent hands from weighted ranges and the rest of the board.
+    Rows where two opponents' hands collide are dropped (rejection sampling).
+    '''
+    taken = np.zeros((n, deck_size), dtype=bool)
+    taken[:, list(known)] = True
+    rows = np.arange(n)
+    valid = np.ones(n, dtype=bool)
+
+    opponent_cards = np.empty((n, len(ranges), 2), dtype=np.int8)
+    for seat, (combos, probabilities) in enumerate(ranges):
+        hands = combos[rng.choice(len(combos), size=n, p=probabilities)]
+        valid &= ~(taken[rows, hands[:, 0]] | taken[rows, hands[:, 1]])
+        taken[rows, hands[:, 0]] = True
+        taken[rows, hands[:, 1]] = True
+        opponent_cards[:, seat] = hands
+
+    keys = rng.random((n, deck_size))
+    keys[taken] = 2.0
+    runout = np.argpartition(keys, missing, axis=1)[:, :missing].astype(np.int8) if missing else np.empty((n, 0), dtype=np.int8)
+    return opponent_cards[valid], runout[valid]
+
+def rollout_chunk(hole_cards, board, dead, opponents, ranges, n, seed):
+    '''
+    Plays n random runouts and returns (share_sum, share_sq_sum, wins, ties, samples).
+    '''
+    rng = np.random.default_rng(seed)
+    known = list(hole_cards) + list(board) + list(dead)
+    missing = 5 - len(board)
+
+    if ranges is None:
+        dealt = deal_batch(n, 2 * opponents + missing, rng, known)
+        opponent_cards = dealt[:, :2 * opponents].reshape(n, opponents, 2)
+        runout = dealt[:, 2 * opponents:]
+    else:
+        opponent_cards, runout = _deal_ranges(n, known, ranges, missing, rng)
+        n = len(runout)
+        if n == 0:
+            return 0.0, 0.0, 0, 0, 0
+
+    common = np.empty((n, 5), dtype=np.int8)
+    common[:, :len(board)] = board
+    common[:, len(board):] = runout
+
+    hero, _ = evaluate_batch(np.hstack([np.tile(np.array(hole_cards, dtype=np.int8), (n, 1)), common]))
+    best = np.zeros(n, dtype=hero.dtype)
+    tied = np.zeros(n, dtype=np.int64)
+    for seat in range(opponents):
+        rank, _ = evaluate_batch(np.hstack([opponent_cards[:, seat], common]))
+        tied += rank == hero
+        best = np.maximum(best, rank)
+
+    win = hero > best
+    tie = hero == best
+    share = np.where(win, 1.0, np.where(tie, 1.0 / (1 + tied), 0.0))
+    return float(share.sum()), float((share * share).sum()), int(win.sum()), int(tie.sum()), n
+
+class EquityCalculator:
+    '''
+    Monte Carlo equity engine.
+
+    Runs rollout chunks across a process pool (processes=0 runs them in the calling process)
+    and stops at the first of: the confidence interval half-width reaching precision, the
+    time limit, or max_samples. Reuse one calculator across decisions to keep the pool warm.
+    '''
+
+    def __init__(self, processes=None, chunk_size=20000, seed=None):
+        self.processes = processes if processes is not None else os.cpu_count()
+        self.chunk_size = chunk_size
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.pool = ProcessPoolExecutor(self.processes) if self.processes != 0 else None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def equity(self, hole_cards, board=(), opponents=1, ranges=None, dead=(),
+               precision=0.005, confidence=0.95, time_limit=None, max_samples=10_000_000):
+        '''
+        Estimates the hero's equity.
+
+        board is a list of cards or a Community_Cards. ranges is None (random opponents) or a
+        list with one entry per opponent: None for a random hand or a {(card, card): weight} dict.
+        '''
+        if isinstance(board, tb.Community_Cards):
+            board = board.cards()
+        hole_cards, board, dead = list(hole_cards), list(board), list(dead)
+        known = hole_cards + board + dead
+        if len(set(known)) != len(known):
+            raise ValueError("Hole cards, board and dead cards must not overlap")
+        if ranges is not None:
+            if len(ranges) != opponents:
+                raise ValueError("ranges needs one entry per opponent")
+            ranges = [range_combos(weights, known) for weights in ranges]
+
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        start = time.perf_counter()
+        totals = [0.0, 0.0, 0, 0, 0]
+
+        def finished():
+            samples = totals[4]
+            if samples >= max_samples:
+                return True
+            if time_limit is not None and time.perf_counter() - start >= time_limit:
+                return True
+            if samples < 2:
+                return False
+            mean = totals[0] / samples
+            variance = max(totals[1] / samples - mean * mean, 0.0)
+            return z * (variance / samples) ** 0.5 <= precision
+
+        def add(result):
+            for i, value in enumerate(result):
+                totals[i] += value
+
+        def chunk_args():
+            seed = self.seed_sequence.spawn(1)[0]
+            return hole_cards, board, dead, opponents, ranges, self.chunk_size, seed
+
+        if self.pool is None:
+            while not finished():
+                add(rollout_chunk(*chunk_args()))
+        else:
+            in_flight = 2 * self.processes
+            pending = {self.pool.submit(rollout_chunk, *chunk_args()) for _ in range(in_flight)}
+            while True:
+                timeout = None if time_limit is None else max(0.0, start + time_limit - time.perf_counter())
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    add(future.result())
+                if finished():
+                    break
+                pending.update(self.pool.submit(rollout_chunk, *chunk_args()) for _ in done)
+            for future in pending:
+                future.cancel()
+
+        samples = totals[4]
+        if samples == 0:
+            raise RuntimeError("No rollouts completed within the time limit")
+        mean = totals[0] / samples
+        variance = max(totals[1] / samples - mean * mean, 0.0)
+        return EquityResult(mean, totals[2] / samples, totals[3] / samples, (variance / samples) ** 0.5,
+                            confidence, samples, time.perf_counter() - start)
+
+def exact_equity(hole_cards, board, dead=(), weights=None):
+    '''
+    Exact heads-up equity on the flop, turn or river.
+
+    Enumerates every remaining runout and every opponent hand, weighted by the optional
+    {(card, card): weight} range (uniform when None).
+    '''
+    start = time.perf_counter()
+    if isinstance(board, tb.Community_Cards):
+        board = board.cards()
+    hole_cards, board, dead = list(hole_cards), list(board), list(dead)
+    if not 3 <= len(board) <= 5:
+        raise ValueError("Exact equity needs a flop, turn or river board")
+    known = hole_cards + board + dead
+    if len(set(known)) != len(known):
+        raise ValueError("Hole cards, board and dead cards must not overlap")
+
+    combos, probabilities = range_combos(weights, known)
+    combos = combos.astype(np.intp)
+    deck = [card for card in range(deck_size) if card not in set(known)]
+
+    # Board state once, extended by each runout (on the river, one empty runout)
+    if len(board) == 5:
+        runouts = np.zeros((1, 0), dtype=np.intp)
+    else:
+        runouts = np.array(list(combinations(deck, 5 - len(board))), dtype=np.intp)
+    runout_keys = card_state_keys[board].sum() + card_state_keys[runouts].sum(axis=1)
+    runout_masks = card_state_masks[board].sum() + card_state_masks[runouts].sum(axis=1)
+
+    hero = state_ranks(runout_keys + card_state_keys[hole_cards].sum(),
+                       runout_masks + card_state_masks[hole_cards].sum())
+
+    # Every (runout, opponent hand) pair is one more add on top of the runout state
+    villain = state_ranks(runout_keys[:, None] + card_state_keys[combos].sum(axis=1),
+                          runout_masks[:, None] + card_state_masks[combos].sum(axis=1))
+
+    used = np.zeros((len(runouts), deck_size), dtype=bool)
+    used[np.arange(len(runouts))[:, None], runouts] = True
+    weight = np.where(used[:, combos[:, 0]] | used[:, combos[:, 1]], 0.0, probabilities)
+    total = weight.sum()
+
+    win = (weight * (hero[:, None] > villain)).sum() / total
+    tie = (weight * (hero[:, None] == villain)).sum() / total
+    return EquityResult(win + tie / 2, win, tie, 0.0, 1.0, int(np.count_nonzero(weight)), time.perf_counter() - start)
+
+def game_exact_equity(game, player, weights=None, dead=()):
+    '''
+    Exact equity of player's hand at the current GameLogic state against the one other player still in the hand.
+    '''
+    opponents = [other for other in game.players
+                 if other is not player and other.game_in_play and not other.folded]
+    if len(opponents) != 1:
+        raise ValueError("Exact equity is heads-up only")
+    return exact_equity(player.hand, game.community_cards, dead, weights)
+
+def game_equity(calculator, game, player, **kwargs):
+    '''
+    Equity of player's hand at the current GameLogic state against every other player still in the hand.
+    '''
+    opponents = sum(1 for other in game.players
+                    if other is not player and other.game_in_play and not other.folded)
+    return calculator.equity(player.hand, game.community_cards, opponents=opponents, **kwargs)
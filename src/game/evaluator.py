@@ -0,0 +1,358 @@
+# evaluator.py
+
+import os
+
+import numpy as np
+
+from game.cards import deck_size, card_rank_bit
+import game.config as cg
+
+# Lookup-table hand evaluator for 5, 6 and 7 card hands
+#
+# A hand's rank is an int from 1 (7-5-4-3-2 high card) to 7462 (royal flush): higher is better
+# and equal ranks tie. Every hand with a flush is scored from flush_ranks, indexed by the
+# 13-bit rank mask of the flush suit. Every other hand only depends on its rank counts, which
+# are packed into a base-5 key (one digit per rank) and looked up in noflush_keys/noflush_ranks.
+# The tables are built once and cached as .npy files in config.table_dir.
+#
+# evaluate_batch scores whole arrays of hands with NumPy. For 7 cards it uses a second set of
+# additive rank keys (as in SKPokerEval) whose sums are unique over every 7-card rank multiset,
+# so the non-flush rank is a direct index into seven_ranks. Flushes are found from a packed
+# per-suit count and only those rows look up their suit's rank mask.
+
+hand_types = [
+    "High Card",
+    "One Pair",
+    "Two Pair",
+    "Three of a Kind",
+    "Straight",
+    "Flush",
+    "Full House",
+    "Four of a Kind",
+    "Straight Flush",
+    "Royal Flush",
+]
+
+hand_classes = 7462
+
+# Base-5 digit of each card's rank in a non-flush key
+rank_keys = tuple(5 ** rank for rank in range(13))
+card_keys = tuple(rank_keys[card // 4] for card in range(deck_size))
+
+seven_rank_keys = (0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181)
+
+# Three bits of suit count per suit
+suit_keys = (1, 1 << 3, 1 << 6, 1 << 9)
+
+wheel_mask = (1 << 12) | 0b1111
+
+def straight_top(mask):
+    '''
+    Returns the top rank (5-14) of the best straight in a 13-bit rank mask, or 0 if there is none.
+    '''
+    for low in range(8, -1, -1):
+        window = 0b11111 << low
+        if mask & window == window:
+            return low + 6
+    if mask & wheel_mask == wheel_mask:
+        return 5
+    return 0
+
+def straight_cards(top):
+    '''
+    Ranks of the straight with the given top card, highest first (the wheel ends with the ace).
+    '''
+    if top == 5:
+        return (5, 4, 3, 2, 14)
+    return tuple(range(top, top - 5, -1))
+
+def classify(counts, flush_mask=0):
+    '''
+    Classifies a hand of up to 7 cards from its rank histogram.
+
+    counts[i] is the number of cards of rank i + 2. flush_mask is the 13-bit rank mask of a suit
+    holding five or more of the cards, or 0. With at most 7 cards a flush rules out quads and full
+    houses, so a flush mask decides the hand on its own.
+
+    Returns (category, cards): the index into hand_types and the ranks of the best five cards in
+    tiebreak order, so comparing the tuples compares the hands.
+    '''
+    if flush_mask:
+        top = straight_top(flush_mask)
+        if top:
+            return (9 if top == 14 else 8), straight_cards(top)
+        return 5, tuple(rank + 2 for rank in range(12, -1, -1) if flush_mask >> rank & 1)[:5]
+
+    mask = 0
+    groups = []
+    for rank in range(12, -1, -1):
+        count = counts[rank]
+        if count:
+            mask |= 1 << rank
+            groups.append((count, rank + 2))
+    groups.sort(reverse=True)
+
+    count, best = groups[0]
+    if count >= 4:
+        kicker = max((rank for _, rank in groups[1:]), default=None)
+        return 7, (best,) * 4 + ((kicker,) if kicker else ())
+
+    second = groups[1][0] if len(groups) > 1 else 0
+    if count == 3 and second >= 2:
+        return 6, (best,) * 3 + (groups[1][1],) * 2
+
+    top = straight_top(mask)
+    if top:
+        return 4, straight_cards(top)
+
+    if count == 3:
+        kickers = sorted((rank for _, rank in groups[1:]), reverse=True)[:2]
+        return 3, (best,) * 3 + tuple(kickers)
+
+    if count == 2 and second == 2:
+        low = groups[1][1]
+        kicker = max((rank for _, rank in groups[2:]), default=None)
+        return 2, (best, best, low, low) + ((kicker,) if kicker else ())
+
+    if count == 2:
+        kickers = sorted((rank for _, rank in groups[1:]), reverse=True)[:3]
+        return 1, (best, best) + tuple(kickers)
+
+    return 0, tuple(rank for _, rank in groups[:5])
+
+def _rank_multisets(size, rank=0):
+    '''
+    Yields every histogram of size cards over ranks rank..12 with at most four cards per rank.
+    '''
+    if rank == 12:
+        if size <= 4:
+            yield (size,)
+        return
+    for count in range(min(size, 4) + 1):
+        for rest in _rank_multisets(size - count, rank + 1):
+            yield (count,) + rest
+
+def build_tables():
+    '''
+    Builds the evaluator tables from scratch.
+
+    Returns (noflush_keys, noflush_ranks, flush_ranks, rank_categories, seven_ranks, flush_suits).
+    '''
+    flush_hands = {}
+    for mask in range(1 << 13):
+        if 5 <= mask.bit_count() <= 7:
+            flush_hands[mask] = classify(None, mask)
+
+    noflush_hands = {}
+    seven_hands = {}
+    five_card_hands = set()
+    for size in (5, 6, 7):
+        for counts in _rank_multisets(size):
+            key = sum(count * rank_keys[rank] for rank, count in enumerate(counts))
+            noflush_hands[key] = classify(counts)
+            if size == 5:
+                five_card_hands.add(noflush_hands[key])
+            if size == 7:
+                seven_hands[sum(count * seven_rank_keys[rank] for rank, count in enumerate(counts))] = noflush_hands[key]
+    assert len(seven_hands) == 49205
+
+    # Every distinct 5-card hand, worst first
+    five_card_hands.update(hand for mask, hand in flush_hands.items() if mask.bit_count() == 5)
+    classes = sorted(five_card_hands)
+    assert len(classes) == hand_classes
+    class_rank = {hand: rank for rank, hand in enumerate(classes, start=1)}
+
+    noflush_keys = np.array(sorted(noflush_hands), dtype=np.int64)
+    noflush_ranks = np.array([class_rank[noflush_hands[key]] for key in noflush_keys.tolist()], dtype=np.int16)
+
+    flush_ranks = np.zeros(1 << 13, dtype=np.int16)
+    for mask, hand in flush_hands.items():
+        flush_ranks[mask] = class_rank[hand]
+
+    rank_categories = np.zeros(hand_classes + 1, dtype=np.int8)
+    for hand, rank in class_rank.items():
+        rank_categories[rank] = hand[0]
+
+    seven_ranks = np.zeros(max(seven_hands) + 1, dtype=np.int16)
+    for key, hand in seven_hands.items():
+        seven_ranks[key] = class_rank[hand]
+
+    # Flush suit (0-3) for each packed suit count, or -1
+    flush_suits = np.full(1 << 12, -1, dtype=np.int8)
+    for packed in range(1 << 12):
+        for suit in range(4):
+            if packed >> (3 * suit) & 7 >= 5:
+                flush_suits[packed] = suit
+
+    return noflush_keys, noflush_ranks, flush_ranks, rank_categories, seven_ranks, flush_suits
+
+table_names = ["noflush_keys", "noflush_ranks", "flush_ranks", "rank_categories", "seven_ranks", "flush_suits"]
+
+def load_tables(table_dir=cg.table_dir):
+    '''
+    Loads the evaluator tables from table_dir (memory-mapped), building and saving them on first use.
+    '''
+    paths = [os.path.join(table_dir, f"evaluator_{name}.npy") for name in table_names]
+    if all(os.path.exists(path) for path in paths):
+        return [np.load(path, mmap_mode='r') for path in paths]
+
+    tables = build_tables()
+    try:
+        os.makedirs(table_dir, exist_ok=True)
+        for path, table in zip(paths, tables):
+            np.save(path, table)
+    except OSError:
+        pass  # Read-only install: keep the tables in memory only
+    return tables
+
+noflush_keys, noflush_ranks, flush_ranks, rank_categories, seven_ranks, flush_suits = load_tables()
+
+# Plain Python views for the scalar path
+_noflush = dict(zip(noflush_keys.tolist(), noflush_ranks.tolist()))
+_flush = flush_ranks.tolist()
+_categories = rank_categories.tolist()
+
+def evaluate(cards):
+    '''
+    Evaluates 5, 6 or 7 integer cards in one pass.
+
+    Returns (rank, category): rank is totally ordered from 1 to 7462 (higher wins, equal ties)
+    and category indexes hand_types.
+    '''
+    if not 5 <= len(cards) <= 7:
+        raise ValueError(f"Only 5, 6 and 7 card hands can be evaluated, got {len(cards)}")
+
+    key = 0
+    suit_masks = [0, 0, 0, 0]
+    for card in cards:
+        key += card_keys[card]
+        suit_masks[card & 3] |= card_rank_bit[card]
+
+    for mask in suit_masks:
+        if mask.bit_count() >= 5:
+            rank = _flush[mask]
+            return rank, _categories[rank]
+
+    rank = _noflush[key]
+    return rank, _categories[rank]
+
+def describe(rank):
+    '''
+    Returns the hand type name of a hand rank.
+    '''
+    return hand_types[_categories[rank]]
+
+class HandState:
+    '''
+    Incrementally evaluated set of cards.
+
+    Keeps the rank histogram, per-suit rank masks and the base-5 non-flush key of the cards
+    added so far, so adding a card is O(1) and rank() is a single table lookup.
+    '''
+
+    def __init__(self, cards=()):
+        self.reset()
+        for card in cards:
+            self.add(card)
+
+    def reset(self):
+        self.count = 0
+        self.key = 0
+        self.rank_counts = [0] * 13
+        self.suit_masks = [0, 0, 0, 0]
+
+    def add(self, card):
+        self.count += 1
+        self.key += card_keys[card]
+        self.rank_counts[card >> 2] += 1
+        self.suit_masks[card & 3] |= card_rank_bit[card]
+
+    def flush_mask(self):
+        return next((mask for mask in self.suit_masks if mask.bit_count() >= 5), 0)
+
+    def rank(self):
+        '''
+        Rank of the 5-7 cards added so far, the same value as evaluate().
+        '''
+        mask = self.flush_mask()
+        if mask:
+            return _flush[mask]
+        return _noflush[self.key]
+
+    def category(self):
+        '''
+        Index into hand_types; also defined for fewer than five cards.
+        '''
+        if self.count >= 5:
+            return _categories[self.rank()]
+        return classify(self.rank_counts)[0]
+
+    def best_hand(self):
+        '''
+        (category, best five ranks in tiebreak order), see classify().
+        '''
+        return classify(self.rank_counts, self.flush_mask())
+
+# Per-card tables for the batch path: the rank key in the low 31 bits and the packed suit
+# count above it, so one gather and add per column yields both
+suit_shift = 31
+_card_batch_keys = np.array([rank_keys[card // 4] | suit_keys[card % 4] << suit_shift for card in range(deck_size)], dtype=np.int64)
+_card_seven_keys = np.array([seven_rank_keys[card // 4] | suit_keys[card % 4] << suit_shift for card in range(deck_size)], dtype=np.int64)
+_card_rank_bits = np.array(card_rank_bit, dtype=np.int16)
+
+def evaluate_batch(cards):
+    '''
+    Evaluates an (N, k) array of integer cards, k = 5, 6 or 7, without per-hand Python work.
+
+    Returns (ranks, categories) as (N,) arrays, with the same values as evaluate().
+    '''
+    cards = np.asarray(cards)
+    if cards.ndim != 2 or not 5 <= cards.shape[1] <= 7:
+        raise ValueError(f"Expected an (N, 5-7) card array, got shape {cards.shape}")
+
+    # Column-major copy so each gather reads contiguous memory
+    columns = cards.T.copy()
+    table = _card_seven_keys if len(columns) == 7 else _card_batch_keys
+    total = table[columns[0]]
+    for column in columns[1:]:
+        total += table[column]
+    keys = total & ((1 << suit_shift) - 1)
+
+    if len(columns) == 7:
+        ranks = seven_ranks[keys]
+    else:
+        ranks = noflush_ranks[np.searchsorted(noflush_keys, keys)]
+
+    suits = flush_suits[total >> suit_shift]
+    rows = np.flatnonzero(suits >= 0)
+    if len(rows):
+        flush_cards = cards[rows]
+        in_suit = (flush_cards & 3) == suits[rows, None]
+        masks = np.bitwise_or.reduce(np.where(in_suit, _card_rank_bits[flush_cards], 0), axis=1)
+        ranks[rows] = flush_ranks[masks]
+
+    return ranks, rank_categories[ranks]
+
+# Additive 7-card state
+#
+# A set of cards is summarized by two int64 sums: card_state_keys (seven-card rank key plus packed
+# suit count) and card_state_masks (each suit's rank mask in its own 13-bit field). Both are plain
+# sums over distinct cards, so a partial board can be computed once and extended card by card.
+
+card_state_keys = _card_seven_keys
+card_state_masks = np.array([card_rank_bit[card] << (13 * (card % 4)) for card in range(deck_size)], dtype=np.int64)
+
+def state_ranks(keys, masks):
+    '''
+    Ranks 7-card states given arrays (any shape) of summed card_state_keys and card_state_masks.
+    '''
+    keys = np.asarray(keys)
+    masks = np.asarray(masks)
+    ranks = seven_ranks[keys & ((1 << suit_shift) - 1)]
+
+    suits = flush_suits[keys >> suit_shift]
+    flush = suits >= 0
+    if flush.any():
+        shifts = 13 * suits[flush].astype(np.int64)
+        ranks[flush] = flush_ranks[(masks[flush] >> shifts) & 0x1FFF]
+    return ranks
@@ -0,0 +1,157 @@
+# events.py
+
+import json
+import sys
+from collections import deque
+
+from game.cards import card_to_name
+
+# Event log
+#
+# GameLogic and Community_Cards report what happens at the table as typed events (blinds, actions,
+# streets, showdowns, payouts) on the process-wide log instead of printing. The log is off by
+# default: with no sink and no buffer, wants() is False and callers skip building the event
+# altogether, so headless play does no formatting at all.
+#
+# Turn it on with log.add_sink(ConsoleSink()) for the old console commentary, log.add_sink(FileSink(path))
+# for a JSON-lines record, or log.enable_buffer(size) to keep the last size events in memory.
+# Events below log.level are dropped.
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
+level_names = {DEBUG: "debug", INFO: "info", WARNING: "warning"}
+
+# Console text of every event kind, formatted from its fields. Actions are keyed by their action field.
+messages = {
+    "blind": "{player} posts the {blind} blind of {amount} chips.",
+    "skip": "{player} {reason}.",
+    "round_end": "Betting round finished.",
+    "street": "{street}: {cards}",
+    "showdown": "{player} shows {cards}: {hand_type}.",
+    "payout": "{player} wins {amount} chips.",
+    "players_left": "{count}",
+    "game_over": "Game over!\n{winner} wins!",
+    "warning": "{message}",
+}
+
+action_messages = {
+    "call": "{player} checks/calls with {amount} chips.",
+    "all-in": "{player} is all-in with {amount} chips.",
+    "raise": "{player} bets/raises {amount} chips.",
+    "fold": "{player} folds.",
+}
+
+class Event:
+    __slots__ = ("kind", "level", "fields")
+
+    def __init__(self, kind, level, fields):
+        self.kind = kind
+        self.level = level
+        self.fields = fields
+
+    def to_dict(self):
+        return {"kind": self.kind, "level": level_names.get(self.level, self.level), **self.fields}
+
+    def text(self):
+        '''
+        Console message of the event. Card fields (ints) are shown by name.
+        '''
+        template = action_messages[self.fields["action"]] if self.kind == "action" else messages[self.kind]
+        fields = dict(self.fields)
+        if "cards" in fields:
+            fields["cards"] = ", ".join(card_to_name[card] for card in fields["cards"])
+        return template.format(**fields)
+
+    def __repr__(self):
+        return f"Event({self.kind!r}, {self.fields!r})"
+
+class ConsoleSink:
+    '''
+    Prints every event as the console commentary of interactive play.
+    '''
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, event):
+        print(event.text(), file=self.stream or sys.stdout)
+
+class FileSink:
+    '''
+    Appends every event to a file as one JSON object per line.
+    '''
+
+    def __init__(self, path, mode="a"):
+        self.path = path
+        self.file = open(path, mode)
+
+    def __call__(self, event):
+        self.file.write(json.dumps(event.to_dict()) + "\n")
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class EventLog:
+    '''
+    Level-gated event stream. Sinks are callables taking an Event.
+    '''
+
+    def __init__(self, level=INFO):
+        self.level = level
+        self.sinks = []
+        self.buffer = None
+        self.enabled = False
+
+    def _update(self):
+        self.enabled = bool(self.sinks) or self.buffer is not None
+
+    def wants(self, level):
+        '''
+        Whether an event at level would be recorded anywhere. Check it before building an event.
+        '''
+        return self.enabled and level >= self.level
+
+    def emit(self, level, kind, **fields):
+        if not self.wants(level):
+            return
+        event = Event(kind, level, fields)
+        if self.buffer is not None:
+            self.buffer.append(event)
+        for sink in self.sinks:
+            sink(event)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        self._update()
+        return sink
+
+    def remove_sink(self, sink):
+        self.sinks.remove(sink)
+        self._update()
+
+    def enable_buffer(self, size):
+        '''
+        Keeps the last size events in self.buffer (size=0 turns the buffer off).
+        '''
+        self.buffer = deque(self.buffer or (), maxlen=size) if size else None
+        self._update()
+
+    def events(self, kind=None):
+        '''
+        Buffered events, oldest first, optionally only those of one kind.
+        '''
+        if self.buffer is None:
+            return []
+        return [event for event in self.buffer if kind is None or event.kind == kind]
+
+    def clear(self):
+        if self.buffer is not None:
+            self.buffer.clear()
+
+# Process-wide log used by the game, off until a sink or buffer is added
+log = EventLog()
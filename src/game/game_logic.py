@@ -1,13 +1,18 @@
 # game_logic.py
 
-import random  as rd
 import numpy as np
 import itertools
 
-from pokereval.card import Card
-from pokereval.hand_evaluator import HandEvaluator
-
-from game.cards import change_card_str, Deck, change_card_num
+from game.cards import Deck, make_rng, card_rank_bit
+from game.evaluator import evaluate, classify, hand_types, hand_classes, HandState
+from game.preflop import preflop_equity
+from game.isomorphism import canonical_key
+from game.cache import LRUCache
+from game.actions import HumanProvider, BetMenu, actions, CHECK_CALL, BET_RAISE, FOLD
+from game.state import GameState
+from game.search import SearchGame
+from game.showdown import side_pots, award
+from game.events import log, DEBUG, INFO
 import game.config as cg
 import game.player as gp
 import game.table as tb
@@ -15,158 +20,32 @@ import game.table as tb
 agents = cg.agents
 
 class Hand:
+    '''
+    A player's hole cards plus the community cards.
+
+    Builds one rank histogram and one suited-rank mask per suit, then classifies the hand
+    from them in a single pass (game.evaluator.classify) with the full ordered 5-card tiebreak.
+    '''
     def __init__(self, hole_cards, community_cards):
         self.cards = hole_cards + community_cards
-        self.ranks = []
-        self.suits = []
-
-        for card in self.cards:
-            rank, suit = change_card_str(card)
-            self.ranks.append(rank)
-            self.suits.append(suit)
-
-    def royal_flush(self):
-        royal_ranks = set([10, 11, 12, 13, 14])
-
-        cards_by_suit = {}
-        for card in self.cards:
-            cards_by_suit.setdefault(card.suit, []).append(card)
+        self.rank_counts = [0] * 13
+        self.suit_masks = [0, 0, 0, 0]
 
-        for suit, cards in cards_by_suit.items():
-            royal_cards = [card for card in cards if card.rank in royal_ranks]
-
-            if len(royal_cards) == 5:
-                ordered = sorted(royal_cards, key=lambda card: card.rank)
-                return {"hand_type": "Royal Flush!", "cards": [card.rank for card in ordered]}
-
-        return None
-    
-    def straight_flush(self):
-        cards_by_suit = {}
         for card in self.cards:
-            cards_by_suit.setdefault(card.suit, []).append(card)
-
-        for suit, cards in cards_by_suit.items():
-            if len(cards) >= 5:
-                ordered = sorted(cards, key=lambda card: card.rank)
-
-                for i in range(len(ordered) - 4):
-                    if all(ordered[i + j].rank == (ordered[i].rank + j) % 14 + 1 for j in range(5)):
-                        return {"hand_type": "Straight Flush", "cards": [card.rank for card in ordered[i:i + 5]]}
-
-                if {14, 2, 3, 4, 5}.issubset(card.rank for card in ordered):
-                    return {"hand_type": "Straight Flush", "cards": [1, 2, 3, 4, 5]}
-
-        return None
+            self.rank_counts[card >> 2] += 1
+            self.suit_masks[card & 3] |= card_rank_bit[card]
 
-    def four_of_a_kind(self):
-        for rank in set(card.rank for card in self.cards):
-            rank_cards = [card for card in self.cards if card.rank == rank]
-            if len(rank_cards) == 4:
-                other_card = next(card for card in self.cards if card.rank != rank)
-                return {"hand_type": "Four of a Kind", "cards": [card.rank for card in rank_cards] + [other_card.rank]}
-
-        return None
-
-    def full_house(self):
-        for rank in set(card.rank for card in self.cards):
-            rank_cards = [card for card in self.cards if card.rank == rank]
-
-            if len(rank_cards) == 3:
-                other_rank = next(other_rank for other_rank in set(card.rank for card in self.cards) if other_rank != rank)
-                other_rank_cards = [card for card in self.cards if card.rank == other_rank]
-                if len(other_rank_cards) >= 2:
-                    return {"hand_type": "Full House", "cards": [card.rank for card in rank_cards + other_rank_cards[:2]]}
-        
-        return None
-    
-    def flush(self):
-        for suit in set(card.suit for card in self.cards):
-            suit_cards = [card for card in self.cards if card.suit == suit]
-            if len(suit_cards) >= 5:
-                ordered = sorted(suit_cards, key=lambda card: card.rank, reverse=True)
-                return {"hand_type": "Flush", "cards": [card.rank for card in ordered[:5]]}
-
-        return None
-
-    def straight(self):
-        unique_ranks = set(card.rank for card in self.cards)
-        if len(unique_ranks) < 5:
-            return None
-
-        sorted_ranks = sorted(unique_ranks)
-        for i in range(len(sorted_ranks) - 4):
-            if all(sorted_ranks[i + j] == sorted_ranks[i] + j for j in range(5)):
-                return {"hand_type": "Straight", "cards": [r for r in range(sorted_ranks[i], sorted_ranks[i] + 5)]}
-
-        if 14 in unique_ranks and 2 in unique_ranks and 3 in unique_ranks and 4 in unique_ranks and 5 in unique_ranks:
-            return {"hand_type": "Straight", "cards": [14, 2, 3, 4, 5]}
-
-        return None
-
-    def three_of_a_kind(self):
-        for rank in set(card.rank for card in self.cards):
-            rank_cards = [card for card in self.cards if card.rank == rank]
-            if len(rank_cards) == 3:
-                other_cards = [card for card in self.cards if card.rank != rank]
-                return {"hand_type": "Three of a Kind", "cards": [card.rank for card in rank_cards] + [other_cards[0].rank, other_cards[1].rank]}
-
-        return None
-
-    def two_pair(self):
-        rank_counts = {}
-        for card in self.cards:
-            rank_counts[card.rank] = rank_counts.get(card.rank, 0) + 1
-
-        pairs = [rank for rank, count in rank_counts.items() if count == 2]
-
-        if len(pairs) >= 2:
-            ordered_pairs = sorted(pairs, reverse=True)
-            try:
-                kicker = next(card.rank for card in self.cards if card.rank not in ordered_pairs)
-            except StopIteration:
-                kicker = None
-
-            return {"hand_type": "Two Pair", "cards": ordered_pairs + [kicker] if kicker is not None else ordered_pairs}
-
-        return None
-
-    def one_pair(self):
-        pairs = [rank for rank in set(self.ranks) if self.ranks.count(rank) == 2]
-
-        if len(pairs) == 1:
-            unique_ranks = sorted(set(self.ranks) - set(pairs), reverse=True)
-            
-            return {"hand_type": "One Pair", "cards": pairs + unique_ranks[:3]}
-
-        return None
-
-    def high_card(self):
-        ordered_cards = sorted(self.cards, key=lambda card: card.rank, reverse=True)
-        return {"hand_type": "High Card", "cards": [ordered_cards[0].rank]}
+        flush_mask = next((mask for mask in self.suit_masks if mask.bit_count() >= 5), 0)
+        self.category, self.ranks = classify(self.rank_counts, flush_mask)
 
+    def key(self):
+        '''
+        Comparable key: (category, best five ranks in tiebreak order). Higher wins, equal ties.
+        '''
+        return self.category, self.ranks
 
     def determine_hand(self):
-        hand_checks = [
-            (self.royal_flush, "Royal Flush"),
-            (self.straight_flush, "Straight Flush"),
-            (self.four_of_a_kind, "Four of a Kind"),
-            (self.full_house, "Full House"),
-            (self.flush, "Flush"),
-            (self.straight, "Straight"),
-            (self.three_of_a_kind, "Three of a Kind"),
-            (self.two_pair, "Two Pair"),
-            (self.one_pair, "One Pair"),
-            (self.high_card, "High Card"),
-        ]
-
-        for check_function, hand_type in hand_checks:
-            result = check_function()
-            if result:
-                result["hand_type"] = hand_type
-                return result
-
-        return None
+        return {"hand_type": hand_types[self.category], "cards": list(self.ranks)}
 
 def compare_scores(score_dict):
     # Hand dict has the player name and the players score
@@ -180,12 +59,46 @@ def compare_scores(score_dict):
     sorted_scores = sorted(player_scores.items(), key=lambda x: x[1], reverse=True)
     return sorted_scores[0][0]
 
-def hand_evaluation(player, hole_cards, community_cards):
-    # Use HandEvaluator to get the hand score
-    hand_strength = HandEvaluator.evaluate_hand(hole_cards, community_cards)
+# Process-wide cache of pre-flop hand_evaluation results, shared by every table in the process.
+# Off unless config.evaluation_cache_size is set or evaluation_cache.resize() is called.
+evaluation_cache = LRUCache(cg.evaluation_cache_size)
+
+def hand_evaluation(player, hole_cards, community_cards, opponents=1):
+    '''
+    Sets and returns player's hand strength, between 0 and 1, and hand description: the hand type,
+    the best ranks in tiebreak order and the evaluator rank (0 before five cards are out).
+    '''
+    cards = hole_cards + community_cards
+
+    if len(cards) >= 5:
+        # Post-flop strength is the hand rank scaled to 0-1. Evaluating is cheaper than building
+        # a cache key, so post-flop hands are never cached.
+        rank, _ = evaluate(cards)
+        hand_strength = rank / hand_classes
+        hand_description = Hand(hole_cards, community_cards).determine_hand()
+        hand_description["rank"] = rank
+        player.set_hand_info(hand_strength, hand_description['hand_type'], rank)
+        return hand_strength, hand_description
+
+    # Suit-isomorphic starting hands score the same, so they share one cache entry.
+    # Cached descriptions are shared between callers and must not be modified.
+    if evaluation_cache.maxsize:
+        key = (canonical_key(hole_cards, community_cards), opponents)
+        cached = evaluation_cache.get(key)
+        if cached is not None:
+            hand_strength, hand_description = cached
+            player.set_hand_info(hand_strength, hand_description['hand_type'])
+            return cached
+
+    # Pre-flop strength is the precomputed equity against opponents random hands
+    hand_strength = preflop_equity(hole_cards, opponents)
 
     # Use Hand to get the hand description
     hand_description = Hand(hole_cards, community_cards).determine_hand()
+    hand_description["rank"] = 0
+
+    if evaluation_cache.maxsize:
+        evaluation_cache.put(key, (hand_strength, hand_description))
 
     # Set hand information for the player
     player.set_hand_info(hand_strength, hand_description['hand_type'])
@@ -194,29 +107,86 @@ def hand_evaluation(player, hole_cards, community_cards):
     return hand_strength, hand_description
 
 class GameLogic:
-    def __init__(self):
-        self.deck = Deck()
-        self.deck.shuffle()
+    def __init__(self, rng=None, providers=None):
+        # All randomness (seating and dealing) comes from this Generator,
+        # see game.cards.make_rng / spawn_rngs for seeding and parallel streams.
+        # Restoring rng.bit_generator.state before new_round() replays that hand exactly.
+        self.rng = make_rng(rng)
 
-        self.pot = 0
-        self.current_bet = 0
-        self.betting_round_pot = 0
+        self.deck = Deck(self.rng)
 
         self.small_blind = cg.small_blind
         self.big_blind = cg.big_blind
 
-        self.players = []
-        for agent in agents:
+        # Each seat's decisions come from its action provider (game.actions), one per entry of
+        # config.agents in the same order; people at the console by default
+        if providers is None:
+            providers = [HumanProvider() for _ in agents]
+
+        # Discrete actions offered to agents, see legal_actions
+        self.bet_menu = BetMenu()
+
+        # game.results.Results filled in with every hand played, when set (see game.history)
+        self.results = None
+
+        # Hands dealt at this table, across games (reset() does not restart it)
+        self.hand_number = 0
+
+        # Players in config.agents order; self.players is the seating, shuffled by reset()
+        self.seats = []
+        self.providers = {}
+        for agent, provider in zip(agents, providers):
             player = gp.Player(agent)
-            self.players.append(player)
-        rd.shuffle(self.players)
+            self.seats.append(player)
+            self.providers[player] = provider
+        self.players = list(self.seats)
+
+        self.community_cards = tb.Community_Cards()
+
+        # Each player's hole cards plus the board, updated card by card as the hand is dealt
+        self.hand_states = {player: HandState() for player in self.players}
+
+        self.game_states = {
+            0: "Pre-Flop",
+            1: "Flop",
+            2: "Turn",
+            3: "River"
+        }
+
+        self.reset()
+
+    def reset(self, seed=None):
+        '''
+        Starts a new game on this table in place: fresh stacks, new seating and positions, an empty
+        board. The players, providers, deck and hand states are reused, so this costs next to nothing
+        compared to building a new table.
+
+        seed, if given, replaces the table's Generator (see game.cards.make_rng); otherwise the table
+        keeps drawing from its current stream. Providers keep their own random state.
+        '''
+        if seed is not None:
+            self.rng = self.deck.rng = make_rng(seed)
+        self.deck.reset()
+
+        self.pot = 0
+        self.current_bet = 0
+        self.betting_round_pot = 0
+
+        self.players[:] = self.seats
+        for player in self.players:
+            player.reset_game()
+            self.hand_states[player].reset()
+        self.rng.shuffle(self.players)
 
         self.dealer_index = 0
         self.small_blind_index = (self.dealer_index + 1) % len(self.players)
         self.big_blind_index = (self.small_blind_index + 1) % len(self.players)
         self.active_player_index = (self.big_blind_index + 1) % len(self.players)
 
-        self.community_cards = tb.Community_Cards()
+        # Seat whose decision is being asked for, None outside a betting round
+        self.to_act_index = None
+
+        self.community_cards.reset()
 
         self.players_dealt = False
         self.flop_dealt = False
@@ -224,15 +194,20 @@ class GameLogic:
         self.river_dealt = False
         self.game_over = False
 
-        self.game_states = {
-            0: "Pre-Flop",
-            1: "Flop",
-            2: "Turn",
-            3: "River"
-        }
-
         self.game_state = self.game_states[0]
 
+    def snapshot(self):
+        # Compact, cheaply cloneable copy of the table (see game.state)
+        return GameState.from_game(self)
+
+    def restore(self, state):
+        # Puts the table back into a snapshot taken from it
+        return state.restore(self)
+
+    def search_game(self):
+        # Apply/undo twin of the table for tree search, from the start of a betting round (see game.search)
+        return SearchGame.from_game(self)
+
     def rotate_positions(self):
         # Rotate dealer index
         self.dealer_index = (self.dealer_index + 1) % len(self.players)
@@ -248,24 +223,26 @@ class GameLogic:
 
     def new_round(self):
         # Resets the game state for a new round
-        # Resets Deck
-        # Shuffles Deck
+        # Resets Deck (reuses the table's card array)
         # Rotates small and big blind and dealer
         # Sets active player
-        self.deck = Deck()
-        self.deck.shuffle()
+        self.deck.reset()
         self.rotate_positions()
+        for state in self.hand_states.values():
+            state.reset()
 
     def deal_hole_cards(self):
-        for player in self.players:
-            if player.game_in_play:
-                player.hand.append(self.deck.deal_card())
+        for _ in range(2):
+            for player in self.players:
+                if player.game_in_play:
+                    card = self.deck.deal_card()
+                    player.hand.append(card)
+                    self.hand_states[player].add(card)
 
-        for player in self.players:
-            if player.game_in_play:
-                player.hand.append(self.deck.deal_card())
-        
         self.players_dealt = True
+        self.hand_number += 1
+        if self.results is not None:
+            self.results.start_hand(self)
 
     def highest_bet(self):
         highest_bet = 0
@@ -281,10 +258,8 @@ class GameLogic:
         # Get the players in play and in game
         active_player_index = self.active_player_index
 
-        if pre_flop:
-            highest_bet = 2
-        else:
-            highest_bet = 0
+        # Blinds already posted count towards the bet to match
+        highest_bet = self.highest_bet()
 
         round_finished = False
 
@@ -292,17 +267,21 @@ class GameLogic:
             current_player = self.players[active_player_index]
             
             if current_player.game_in_play == False:
-                print(f"{current_player.name} is out of the game.")
+                if log.wants(DEBUG):
+                    log.emit(DEBUG, "skip", player=current_player.name, reason="is out of the game")
 
             elif current_player.all_in:
-                print(f"{current_player.name} is all-in.")
+                if log.wants(DEBUG):
+                    log.emit(DEBUG, "skip", player=current_player.name, reason="is all-in")
 
             elif current_player.folded:
-                print(f"{current_player.name} has folded.")
+                if log.wants(DEBUG):
+                    log.emit(DEBUG, "skip", player=current_player.name, reason="has folded")
 
             elif current_player.round_played == False or current_player.bet < self.highest_bet():
 
                 # Let the player choose their action
+                self.to_act_index = active_player_index
                 action = self.get_player_action(current_player, highest_bet)
 
                 if action == '0':
@@ -311,9 +290,6 @@ class GameLogic:
                     self.bet_raise(current_player, highest_bet)
                 elif action == '2':
                     self.fold(current_player)
-                else:
-                    print("Invalid action. Please choose from 1(check_call), 2(bet_raise), or 3(fold).")
-                    continue
 
                 current_player.round_played = True
                 highest_bet = self.highest_bet()
@@ -321,13 +297,14 @@ class GameLogic:
             active_player_index = (active_player_index + 1) % len(self.players)
 
             # Check if all active players have matched the highest bet or gone all-in or folded
-            round_finished = all(
+            round_finished = len(self.players_in_hand()) <= 1 or all(
                 not player.game_in_play or player.all_in or player.folded or (
                     (player.bet == highest_bet and player.round_played)
                 )
                 for player in self.players
             )
 
+        self.to_act_index = None
         self.pot += self.betting_round_pot
         self.betting_round_pot = 0
 
@@ -335,37 +312,37 @@ class GameLogic:
         for player in self.players:
             player.reset_betting()
 
-        print("Betting round finished.")
+        if log.wants(DEBUG):
+            log.emit(DEBUG, "round_end", pot=self.pot)
 
 
     def get_player_action(self, player, highest_bet):
-        if highest_bet == 0:
-            options = "0 1 2"
-        else:
-            options = "0 1 2"
-
-        try:
-            action = input(f"{player.name}, choose your action (Check(0), Bet/Raise(1), Fold(2)): ")
-        except ValueError:
-            print("Invalid input. Please enter a valid action.")
-            return self.get_player_action(player, highest_bet)
-
-        if action not in options.split():
-            print("Invalid action. Please choose a valid action.")
-            return self.get_player_action(player, highest_bet)
-
+        action = self.providers[player].action(self, player, highest_bet)
+        if action not in actions:
+            raise ValueError(f"Invalid action {action!r} for {player.name}")
         return action
 
+    def legal_actions(self, player, menu=None):
+        '''
+        (mask, amounts) of the bet menu for player: which menu slots are legal and the chips each adds.
+        '''
+        menu = menu or self.bet_menu
+        return menu.options(self.pot + self.betting_round_pot, self.highest_bet() - player.bet, player.chipcount)
+
     def check_call(self, player, highest_bet):
-        print(f"Highest bet: {highest_bet}")
-        if player.chipcount >= highest_bet:
+        if player.chipcount >= highest_bet - player.bet:
             bet_amount = (highest_bet - player.bet)
-            print(f"{player.name} checks/calls with {bet_amount} chips.")
+            action = "call"
         else:
             bet_amount = player.chipcount
-            print(f"{player.name} is all-in with {bet_amount} chips.")
+            action = "all-in"
+        if log.wants(INFO):
+            log.emit(INFO, "action", player=player.name, action=action, amount=bet_amount, highest_bet=highest_bet)
+        if self.results is not None:
+            self.results.add_action(self.players.index(player), CHECK_CALL, bet_amount)
 
         player.bet += bet_amount
+        player.contributed += bet_amount
         player.chipcount -= bet_amount
 
         if player.chipcount == 0:
@@ -374,19 +351,16 @@ class GameLogic:
         self.betting_round_pot += bet_amount
 
     def bet_raise(self, player, highest_bet):
-        try:
-            bet_amount = int(input(f"{player.name}, enter your bet amount (current highest bet: {highest_bet}): "))
-        except ValueError:
-            print("Invalid input. Please enter a valid bet amount.")
-            return self.bet_raise(player, highest_bet)
+        bet_amount = self.providers[player].bet_amount(self, player, highest_bet)
 
         # Validate the bet amount
         if (bet_amount + player.bet) < highest_bet or bet_amount > player.chipcount:
-            print("Invalid bet amount. Please enter a valid amount within the allowed range.")
-            return self.bet_raise(player, highest_bet)
+            raise ValueError(f"Invalid bet amount {bet_amount} for {player.name} (highest bet {highest_bet}, "
+                             f"bet {player.bet}, chips {player.chipcount})")
 
         # Process the bet raise
         player.bet += bet_amount
+        player.contributed += bet_amount
         player.chipcount -= bet_amount
         
         if player.chipcount == 0:
@@ -394,27 +368,34 @@ class GameLogic:
         
         self.betting_round_pot += bet_amount
 
+        if log.wants(INFO):
+            log.emit(INFO, "action", player=player.name, action="raise", amount=bet_amount, highest_bet=highest_bet)
+        if self.results is not None:
+            self.results.add_action(self.players.index(player), BET_RAISE, bet_amount)
+
         return bet_amount
     
     def fold(self, player):
-        print(f"{player.name} folds.")
+        if log.wants(INFO):
+            log.emit(INFO, "action", player=player.name, action="fold", amount=0, highest_bet=self.highest_bet())
+        if self.results is not None:
+            self.results.add_action(self.players.index(player), FOLD, 0)
         player.folded = True
 
 
     def request_bet(self, player):
-        try:
-            bet_amount = int(input(f"{player.name}, enter your bet amount: "))
-        except ValueError:
-            print("Invalid input. Please enter a valid bet amount.")
-            return self.request_bet(player)
+        bet_amount = self.providers[player].bet_amount(self, player, player.bet)
 
         # Validate the bet amount
         if bet_amount < 0 or bet_amount > player.chipcount:
-            print("Invalid bet amount. Please enter a valid amount within your chip range.")
-            return self.request_bet(player)
+            raise ValueError(f"Invalid bet amount {bet_amount} for {player.name} (chips {player.chipcount})")
 
         return bet_amount
-    
+
+    def players_in_hand(self):
+        # Players who can still win the pot
+        return [player for player in self.players if player.game_in_play and not player.folded]
+
     def update_active_players(self):
         # Update the active player indices to skip players who are out of the game
         active_player_indices = [i for i, player in enumerate(self.players) if player.game_in_play]
@@ -428,19 +409,27 @@ class GameLogic:
         for i in active_player_indices:
             player = self.players[i]
             if i == active_player_indices[0]:
-                self.pot += cg.small_blind
-                player.chipcount -= cg.small_blind
-                player.bet += cg.small_blind
-                print(f"{player.name} posts the small blind of {cg.small_blind} chips.")
+                self.post_blind(player, cg.small_blind)
+                if log.wants(INFO):
+                    log.emit(INFO, "blind", player=player.name, blind="small", amount=cg.small_blind)
 
         # Big blind
         for i in active_player_indices:
             player = self.players[i]
             if i == active_player_indices[1]:
-                self.pot += cg.big_blind
-                player.chipcount -= cg.big_blind
-                player.bet += cg.big_blind
-                print(f"{player.name} posts the big blind of {cg.big_blind} chips.")
+                self.post_blind(player, cg.big_blind)
+                if log.wants(INFO):
+                    log.emit(INFO, "blind", player=player.name, blind="big", amount=cg.big_blind)
+
+    def post_blind(self, player, blind):
+        # A player short of the blind is all-in for what they have
+        amount = min(blind, player.chipcount)
+        self.pot += amount
+        player.chipcount -= amount
+        player.bet += amount
+        player.contributed += amount
+        if player.chipcount == 0:
+            player.all_in = True
 
     def pre_flop(self, pre_flop=True):
         self.update_active_players()
@@ -451,6 +440,9 @@ class GameLogic:
         self.deck.deal_card()  # burn card
         self.flop_cards = [self.deck.deal_card() for _ in range(3)]
         self.community_cards.insert_flop(self.flop_cards)
+        self.add_community_cards(self.flop_cards)
+        if self.results is not None:
+            self.results.add_community_cards(self.flop_cards)
         return True, self.flop_cards
 
     def pre_turn(self, pre_flop=False):
@@ -461,6 +453,9 @@ class GameLogic:
         self.deck.deal_card()  # burn card
         self.turn_card = self.deck.deal_card()
         self.community_cards.insert_turn(self.turn_card)
+        self.add_community_cards([self.turn_card])
+        if self.results is not None:
+            self.results.add_community_cards([self.turn_card])
         return True, self.turn_card
 
     def pre_river(self, pre_flop=False):
@@ -471,41 +466,71 @@ class GameLogic:
         self.deck.deal_card()  # burn card
         self.river_card = self.deck.deal_card()
         self.community_cards.insert_river(self.river_card)
+        self.add_community_cards([self.river_card])
+        if self.results is not None:
+            self.results.add_community_cards([self.river_card])
         return True, self.river_card
 
+    def add_community_cards(self, cards):
+        # Only the new cards are added to each hand state
+        for player, state in self.hand_states.items():
+            if player.hand:
+                for card in cards:
+                    state.add(card)
+
+    def evaluate_hands(self, opponents=1):
+        '''
+        Sets every dealt player's hand strength and type: the hand rank from their hand state, scaled
+        to 0-1, once five cards are out, before that the pre-flop equity against opponents random hands
+        from hand_evaluation (and its cache).
+        '''
+        for player, state in self.hand_states.items():
+            if not player.hand:
+                continue
+            if state.count >= 5:
+                rank = state.rank()
+                player.set_hand_info(rank / hand_classes, hand_types[state.category()], rank)
+            else:
+                hand_evaluation(player, player.hand, [], opponents)
+
     def showdown(self, pre_flop=False):
         self.betting_round()
         pass
 
     def winner_winner(self):
         # Get a list of players eligible for winning
-        players_eligible = []
-        for player in self.players:
-            if player.folded == False:
-                players_eligible.append(player)
+        players_eligible = self.players_in_hand()
 
-        # Sort the players by hand strength)
-        sorted_players = sorted(players_eligible, key=lambda player: player.hand_strength, reverse=True)
-
-        # Find the winner(s)
-        winning_players = [sorted_players[0]]
-        max_hand_strength = sorted_players[0].hand_strength
-
-        for player in sorted_players[1:]:
-            if player.hand_strength == max_hand_strength:
-                winning_players.append(player)
-            else:
-                break
-
-        # Handle tie and split the pot evenly
-        if len(winning_players) > 1:
-            # Split the pot evenly among tied players
-            share_of_pot = self.pot / len(winning_players)
-            for winner in winning_players:
-                winner.chipcount += share_of_pot
+        # Score each hand from its hand state so the showdown does not depend on hand_evaluation having run.
+        # A full board gives integer ranks; without one, fall back to the classified best hand.
+        states = self.hand_states
+        if self.community_cards.rivercard is not None:
+            hand_keys = [states[player].rank() if player in players_eligible else None for player in self.players]
         else:
-            # Only one winner, give them the entire pot
-            winning_players[0].chipcount += self.pot
+            hand_keys = [states[player].best_hand() if player in players_eligible else None for player in self.players]
+
+        # Build the main and side pots from what each player put in, and pay each to its best hand.
+        # Odd chips from a split go to the first winners left of the dealer.
+        pots = side_pots([player.contributed for player in self.players],
+                         [player in players_eligible for player in self.players])
+        payouts = award(pots, hand_keys, (self.dealer_index + 1) % len(self.players))
+
+        if len(players_eligible) > 1 and log.wants(INFO):
+            for player in players_eligible:
+                log.emit(INFO, "showdown", player=player.name, cards=list(player.hand),
+                         hand_type=hand_types[states[player].category()])
+
+        # Chips won by each player this hand
+        self.payouts = {}
+        for player, won in zip(self.players, payouts):
+            if won:
+                player.chipcount += won
+                self.payouts[player.name] = won
+                if log.wants(INFO):
+                    log.emit(INFO, "payout", player=player.name, amount=won)
+        if self.results is not None:
+            ranks = [key if isinstance(key, int) else 0 for key in hand_keys]
+            self.results.end_hand(payouts, [player.contributed for player in self.players], ranks)
 
     def end_round(self):
 
@@ -519,7 +544,8 @@ class GameLogic:
             if player.game_in_play:
                 self.winner.append(player)
                 still_in_game += 1
-        print(still_in_game)
+        if log.wants(DEBUG):
+            log.emit(DEBUG, "players_left", count=still_in_game)
         if still_in_game <= 1:
             self.end_game()
             pass
@@ -534,9 +560,10 @@ class GameLogic:
         self.cards_dealt = False
         for player in self.players:
                 player.reset_round()
+                self.hand_states[player].reset()
 
     def end_game(self):
-        print("Game over!")
-        print(f"{self.winner[0].name} wins!")
-        self.__init__()
+        if log.wants(INFO):
+            log.emit(INFO, "game_over", winner=self.winner[0].name)
+        self.reset()
         pass
\ No newline at end of file
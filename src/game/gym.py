@@ -9,17 +9,22 @@ from torch import nn
 from game.game_logic import GameLogic
 from game.player import Player
 from game.table import Community_Cards
+from game.equity import exact_equity
+from game.preflop import preflop_equity
+from game.abstraction import bucket
 
 class PokerEnv(gym.Env):
     def __init__(self):
         super(PokerEnv, self).__init__()
 
         self.game = GameLogic()
-        self.action_space = spaces.Discrete(4)  # Fold, Check/Call, Bet/Raise
+        self.hand_strengths = {}
+        self.hand_strengths_hand = None  # game.hand_number the cached strengths belong to
+        self.action_space = spaces.Discrete(self.game.bet_menu.size)  # Fold, Check/Call, raise sizes, all-in (game.actions.BetMenu)
         self.observation_space = spaces.Dict({
             'game_state': spaces.Discrete(4), # Represents the stage of the game (pre-flop, flop, turn, river)
             'player_hand': spaces.MultiDiscrete([[[2, 14], [1, 4]], [[2, 14], [1, 4]]]),  # Rank and suit of each card in the hand
-            'hand_strength': spaces.Box(low=0, high=np.inf, shape=(1,)),  # Hand strength overall
+            'hand_strength': spaces.Box(low=0, high=1, shape=(1,)),  # Hand strength overall, see Player.hand_strength
             'hand_strength_2_cards': spaces.Box(low=0, high=np.inf, shape=(1,)),  # Hand strength with 2 cards
             'hand_strength_5_cards': spaces.Box(low=0, high=np.inf, shape=(1,)),  # Hand strength with 5 cards (flop)
             'hand_strength_6_cards': spaces.Box(low=0, high=np.inf, shape=(1,)),  # Hand strength with 6 cards (turn)
@@ -77,11 +82,11 @@ class PokerEnv(gym.Env):
         '''
         Function that outputs the community cards, player bets, and player chips.
         '''
-        self.community_cards = 
+        self.community_cards = self.game.community_cards.cards()
         pass
 
     def PrivateObservationFunction(self):
-        self.agent_hand = 
+        self.agent_hand = self.game.players[self.game.active_player_index].hand
         pass
 
     def Policy(self):
@@ -113,8 +118,10 @@ class PokerEnv(gym.Env):
     def InfoState(self):
         pass
 
-    def reset(self):
-        self.game = GameLogic()  # Reset the game for a new episode
+    def reset(self, seed=None):
+        self.game.reset(seed)  # New episode on the same table, reset in place
+        self.hand_strengths = {}
+        self.hand_strengths_hand = None
         # Return initial observation
         return np.array([0])
 
@@ -129,6 +136,45 @@ class PokerEnv(gym.Env):
         # Return the current observation, reward, and additional information
         return np.array([0]), reward, done, {}
     
+    def action_mask(self):
+        '''
+        Legal-action mask over action_space for the player to act (all False between decisions).
+        '''
+        if self.game.to_act_index is None:
+            return np.zeros(self.game.bet_menu.size, dtype=bool)
+        player = self.game.players[self.game.to_act_index]
+        mask, _ = self.game.legal_actions(player)
+        return np.array(mask, dtype=bool)
+
+    def hand_strength_observation(self, player):
+        '''
+        Street hand strengths for player: pre-flop table equity against the players still in the hand
+        ('hand_strength_2_cards') and exact heads-up equity on the flop ('hand_strength_5_cards')
+        and turn ('hand_strength_6_cards'). Each street is computed once and kept for the rest of the hand.
+        '''
+        if self.hand_strengths_hand != self.game.hand_number:
+            self.hand_strengths = {}
+            self.hand_strengths_hand = self.game.hand_number
+        strengths = self.hand_strengths.setdefault(player.name, {})
+        board = self.game.community_cards.cards()
+
+        if 'hand_strength_2_cards' not in strengths:
+            opponents = sum(1 for other in self.game.players
+                            if other is not player and other.game_in_play and not other.folded)
+            strengths['hand_strength_2_cards'] = np.array([preflop_equity(player.hand, max(opponents, 1))], dtype=np.float32)
+
+        for size, key in ((3, 'hand_strength_5_cards'), (4, 'hand_strength_6_cards')):
+            if len(board) >= size and key not in strengths:
+                strengths[key] = np.array([exact_equity(player.hand, board[:size]).equity], dtype=np.float32)
+
+        return strengths
+
+    def hand_bucket_observation(self, player):
+        '''
+        Card abstraction bucket of player's hand on the current street (see game.abstraction).
+        '''
+        return bucket(player.hand, self.game.community_cards.cards())
+
     def get_player_observations(self):
         # Define how to get the observation for each player
         player_observations = {}
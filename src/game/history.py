@@ -0,0 +1,289 @@
+# history.py
+
+import json
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from game.results import Results
+from game.state import no_card
+
+# Hand-history store
+#
+# HandHistoryWriter appends finished hands (game.results.Results) to a binary file in chunks of
+# chunk_hands hands. Each chunk is columnar: one fixed-width array per field below, each compressed
+# on its own with zlib (level 0 stores it raw). Nothing is ever rewritten, so a file can be reopened
+# and appended to. A chunk cut short by a crash is not read back, and is cut off the file when it is
+# reopened for appending.
+#
+# Layout, all little-endian:
+#   header   b"RLPH", version (u2), seats (u2), length of the JSON names (u4), names
+#   chunk    b"CHNK", hands (u4), decisions (u4), compression level (u1),
+#            then for every column in hand_columns and decision_columns order:
+#            stored length (u4) and the (compressed) bytes
+#
+# HandHistoryReader memory-maps the file, indexes the chunks with one pass over their headers and
+# decompresses a chunk only when it is asked for. Uncompressed chunks are read in place, without copying.
+#
+# Per hand, by seat in table order (cards are -1 when not dealt):
+hand_columns = {
+    "seating": (np.int8, ("seats",)),       # index of the seat's player in the file's names
+    "dealer": (np.int8, ()),
+    "active": (np.int8, ()),                # first seat to act on every street
+    "hole": (np.int8, ("seats", 2)),
+    "board": (np.int8, (5,)),
+    "stacks": (np.int32, ("seats",)),       # chips at the start of the hand, before the blinds
+    "payouts": (np.int32, ("seats",)),      # chips won from the pot
+    "net": (np.int32, ("seats",)),          # payouts minus chips put in
+    "ranks": (np.uint16, ("seats",)),       # showdown hand ranks on a full board, 0 otherwise
+    "decisions": (np.uint16, ()),           # number of decisions in the hand
+}
+
+# Per decision, hand after hand (see Results.add_action):
+decision_columns = {
+    "seat": (np.int8, ()),
+    "street": (np.int8, ()),
+    "action": (np.int8, ()),
+    "amount": (np.int32, ()),
+}
+
+magic = b"RLPH"
+chunk_magic = b"CHNK"
+version = 2
+header_format = struct.Struct("<4sHHI")
+chunk_format = struct.Struct("<4sIIB")
+length_format = struct.Struct("<I")
+
+def _shape(shape, seats):
+    return tuple(seats if size == "seats" else size for size in shape)
+
+def _chunk_end(buffer, offset):
+    # End of the complete chunk at offset in buffer, or None
+    size = len(buffer)
+    if offset + chunk_format.size > size or chunk_format.unpack_from(buffer, offset)[0] != chunk_magic:
+        return None
+    position = offset + chunk_format.size
+    for _ in range(len(hand_columns) + len(decision_columns)):
+        if position + length_format.size > size:
+            return None
+        position += length_format.size + length_format.unpack_from(buffer, position)[0]
+    return position if position <= size else None
+
+class HandHistoryWriter:
+    '''
+    Appends hands to the file at path, creating it if needed. names are the players that can appear
+    at the table (config.agents by default); an existing file must have been written with the same
+    names. Use as a context manager or call close() to write the last, partial chunk.
+    '''
+
+    def __init__(self, path, names, chunk_hands=65536, level=1):
+        self.path = path
+        self.names = list(names)
+        self.seat_of = {name: seat for seat, name in enumerate(self.names)}
+        self.seats = len(self.names)
+        self.chunk_hands = chunk_hands
+        self.level = level
+        self.hands_written = 0
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as file:
+                _, stored, end = read_header(file)
+                if stored != self.names:
+                    raise ValueError(f"{path} holds hands of {stored}, not {self.names}")
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    while True:
+                        chunk_end = _chunk_end(view, end)
+                        if chunk_end is None:
+                            break
+                        end = chunk_end
+            # Drop a torn last chunk so the new chunks follow the last complete one
+            if end < os.path.getsize(path):
+                os.truncate(path, end)
+        self.file = open(path, "ab")
+        if not exists:
+            encoded = json.dumps(self.names).encode()
+            self.file.write(header_format.pack(magic, version, self.seats, len(encoded)) + encoded)
+        self._clear()
+
+    def _clear(self):
+        self.hands = 0
+        self.columns = {name: [] for name in hand_columns}
+        self.decision_values = {name: [] for name in decision_columns}
+
+    def write(self, results):
+        '''
+        Adds one finished hand. The columns copy what they need, so results can be reused.
+        '''
+        seats = self.seats
+        columns = self.columns
+        if len(results.players) != seats:
+            raise ValueError(f"Expected a hand with {seats} seats, got {len(results.players)}")
+
+        columns["seating"].extend(self.seat_of[name] for name in results.players)
+        columns["dealer"].append(results.dealer)
+        columns["active"].append(results.active)
+        for hand in results.hands:
+            columns["hole"].extend(hand)
+            columns["hole"].extend([no_card] * (2 - len(hand)))
+        board = results.community_cards
+        columns["board"].extend(board)
+        columns["board"].extend([no_card] * (5 - len(board)))
+        columns["stacks"].extend(results.stacks)
+        columns["payouts"].extend(results.payouts or [0] * seats)
+        columns["net"].extend(results.net or [0] * seats)
+        columns["ranks"].extend(results.ranks or [0] * seats)
+        columns["decisions"].append(len(results.decisions))
+
+        values = self.decision_values
+        for seat, street, action, amount in results.decisions:
+            values["seat"].append(seat)
+            values["street"].append(street)
+            values["action"].append(action)
+            values["amount"].append(amount)
+
+        self.hands += 1
+        if self.hands >= self.chunk_hands:
+            self.flush()
+
+    def flush(self):
+        '''
+        Writes the hands buffered so far as one chunk.
+        '''
+        if not self.hands:
+            return
+        parts = [chunk_format.pack(chunk_magic, self.hands, len(self.decision_values["seat"]), self.level)]
+        for table, values in ((hand_columns, self.columns), (decision_columns, self.decision_values)):
+            for name, (dtype, _) in table.items():
+                data = np.asarray(values[name], dtype=dtype).astype(np.dtype(dtype).newbyteorder("<"), copy=False).tobytes()
+                if self.level:
+                    data = zlib.compress(data, self.level)
+                parts += [length_format.pack(len(data)), data]
+        self.file.write(b"".join(parts))
+        self.file.flush()
+        self.hands_written += self.hands
+        self._clear()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_header(file):
+    '''
+    (seats, names, header size) of a hand-history file opened for binary reading.
+    '''
+    head = file.read(header_format.size)
+    if len(head) < header_format.size:
+        raise ValueError("Not a hand-history file: too short")
+    tag, file_version, seats, length = header_format.unpack(head)
+    if tag != magic or file_version != version:
+        raise ValueError(f"Not a version {version} hand-history file")
+    return seats, json.loads(file.read(length)), header_format.size + length
+
+class HandHistoryReader:
+    '''
+    Memory-mapped reader of a hand-history file.
+
+    chunk(i) gives the columns of one chunk as a dict of arrays: the hand columns with one row per
+    hand, the decision columns with one row per decision, and "first_decision", each hand's first row in
+    the decision columns. column(name) concatenates a column over the whole file and results() yields
+    every hand as a Results.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.seats, self.names, start = read_header(file)
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.map)
+
+        # Chunk index: (offset of the first column, hands, decisions, level), up to a torn chunk
+        self.chunks = []
+        offset = start
+        while True:
+            end = _chunk_end(self.buffer, offset)
+            if end is None:
+                break
+            _, hands, decisions, level = chunk_format.unpack_from(self.buffer, offset)
+            self.chunks.append((offset + chunk_format.size, hands, decisions, level))
+            offset = end
+
+        self.hands = sum(hands for _, hands, _, _ in self.chunks)
+        self.cached = None
+
+    def __len__(self):
+        return self.hands
+
+    def chunk(self, index):
+        if self.cached is not None and self.cached[0] == index:
+            return self.cached[1]
+        position, hands, decisions, level = self.chunks[index]
+        columns = {}
+        for table, rows in ((hand_columns, hands), (decision_columns, decisions)):
+            for name, (dtype, shape) in table.items():
+                length = length_format.unpack_from(self.buffer, position)[0]
+                data = self.buffer[position + length_format.size:position + length_format.size + length]
+                position += length_format.size + length
+                if level:
+                    data = zlib.decompress(data)
+                array = np.frombuffer(data, dtype=np.dtype(dtype).newbyteorder("<"))
+                columns[name] = array.reshape((rows,) + _shape(shape, self.seats))
+        columns["first_decision"] = np.concatenate([[0], np.cumsum(columns["decisions"], dtype=np.int64)[:-1]])
+        self.cached = (index, columns)
+        return columns
+
+    def column(self, name):
+        '''
+        One column over every chunk.
+        '''
+        return np.concatenate([self.chunk(index)[name] for index in range(len(self.chunks))])
+
+    def results(self):
+        '''
+        Yields every hand, in file order, as a Results.
+        '''
+        names = self.names
+        for index in range(len(self.chunks)):
+            columns = self.chunk(index)
+            # Plain lists once per chunk, not per hand
+            rows = {name: columns[name].tolist() for name in hand_columns}
+            decisions = list(zip(*(columns[name].tolist() for name in decision_columns)))
+            first = columns["first_decision"].tolist()
+            for hand in range(len(rows["dealer"])):
+                results = Results()
+                results.players = [names[seat] for seat in rows["seating"][hand]]
+                results.hands = [[card for card in cards if card != no_card] for cards in rows["hole"][hand]]
+                results.community_cards = [card for card in rows["board"][hand] if card != no_card]
+                results.stacks = rows["stacks"][hand]
+                results.dealer = rows["dealer"][hand]
+                results.active = rows["active"][hand]
+                results.payouts = rows["payouts"][hand]
+                results.net = rows["net"][hand]
+                results.ranks = rows["ranks"][hand]
+                results.decisions = decisions[first[hand]:first[hand] + rows["decisions"][hand]]
+                results.hand_winner = results.players[max(range(len(results.net)), key=results.net.__getitem__)]
+                yield results
+
+    def close(self):
+        self.cached = None
+        self.buffer = None
+        try:
+            self.map.close()
+        except BufferError:
+            # Arrays of uncompressed chunks still look into the file; it closes when they are gone
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,422 @@
+# isomorphism.py
+
+from bisect import bisect_right
+from itertools import product
+from math import comb
+
+import numpy as np
+
+# Suit-isomorphic hand indexing
+#
+# Hands that only differ by a permutation of suits play identically. A HandIndexer maps cards dealt
+# over rounds (e.g. (2, 3): hole cards, then the flop) to a dense index 0..size-1 of their suit
+# isomorphism class, and back to a canonical representative.
+#
+# Each suit is described by its configuration (how many of its cards fall in each round) and an
+# index of its per-round rank sets (colex rank of each round's ranks among those not used by earlier
+# rounds, combined mixed-radix). A hand is then the multiset of (configuration, index) over the four
+# suits: suits are ordered by configuration, suits sharing a configuration form a multiset of indices
+# (ranked with the combinatorial number system), and every sorted list of configurations gets an
+# offset of its own.
+
+ranks = 13
+
+def _colex(positions):
+    return sum(comb(position, k) for k, position in enumerate(sorted(positions), start=1))
+
+def _uncolex(index, count):
+    '''
+    Returns the count positions whose colex rank is index.
+    '''
+    positions = []
+    for k in range(count, 0, -1):
+        position = k - 1
+        while comb(position + 1, k) <= index:
+            position += 1
+        positions.append(position)
+        index -= comb(position, k)
+    return positions
+
+def _multiset_rank(values):
+    '''
+    Rank of a multiset of non-negative ints among multisets of the same size.
+    '''
+    values = sorted(values, reverse=True)
+    size = len(values)
+    return sum(comb(value + size - j, size - j + 1) for j, value in enumerate(values, start=1))
+
+def _multiset_unrank(index, size):
+    values = []
+    for j in range(1, size + 1):
+        k = size - j + 1
+        top = k - 1
+        while comb(top + 1, k) <= index:
+            top += 1
+        index -= comb(top, k)
+        values.append(top - (size - j))
+    return values
+
+class HandIndexer:
+    '''
+    Dense index of suit isomorphism classes for cards dealt over the given rounds.
+
+    Cards are passed round by round in one flat sequence, e.g. hole cards then board.
+    '''
+
+    def __init__(self, rounds):
+        self.rounds = tuple(rounds)
+        self.cards = sum(self.rounds)
+        self.code_base = 8 ** len(self.rounds)
+
+        # Every per-suit configuration and the number of rank-set combinations it allows
+        self.suit_sizes = {}
+        for counts in product(*(range(min(ranks, n) + 1) for n in self.rounds)):
+            if sum(counts) <= ranks:
+                size, left = 1, ranks
+                for count in counts:
+                    size *= comb(left, count)
+                    left -= count
+                self.suit_sizes[counts] = size
+
+        # Every way to split each round's cards over the four suits, up to suit permutation
+        splits = [[split for split in product(range(n + 1), repeat=4) if sum(split) == n] for n in self.rounds]
+        configurations = set()
+        for per_round in product(*splits):
+            suits = tuple(sorted((tuple(split[suit] for split in per_round) for suit in range(4)), reverse=True))
+            if all(counts in self.suit_sizes for counts in suits):
+                configurations.add(suits)
+        self.configurations = sorted(configurations)
+
+        self.offsets = []
+        self.size = 0
+        for configuration in self.configurations:
+            self.offsets.append(self.size)
+            self.size += self._configuration_size(configuration)
+
+        self.configuration_keys = {self._configuration_key(configuration): position
+                                   for position, configuration in enumerate(self.configurations)}
+        self._batch_tables = None
+        self._unbatch_tables = None
+
+    def _groups(self, configuration):
+        groups = []
+        for counts in configuration:
+            if groups and groups[-1][0] == counts:
+                groups[-1][1] += 1
+            else:
+                groups.append([counts, 1])
+        return groups
+
+    def _configuration_size(self, configuration):
+        size = 1
+        for counts, members in self._groups(configuration):
+            size *= comb(self.suit_sizes[counts] + members - 1, members)
+        return size
+
+    def _code(self, counts):
+        code = 0
+        for count in counts:
+            code = code * 8 + count
+        return code
+
+    def _configuration_key(self, configuration):
+        key = 0
+        for counts in configuration:
+            key = key * self.code_base + self._code(counts)
+        return key
+
+    def _suit_index(self, masks):
+        '''
+        Index of one suit's per-round rank masks within its configuration.
+        '''
+        index, multiplier, used, left = 0, 1, 0, ranks
+        for mask in masks:
+            positions = [rank - (used & ((1 << rank) - 1)).bit_count() for rank in range(ranks) if mask >> rank & 1]
+            index += _colex(positions) * multiplier
+            multiplier *= comb(left, len(positions))
+            left -= len(positions)
+            used |= mask
+        return index
+
+    def _suit_masks(self, counts, index):
+        masks, used, left = [], 0, ranks
+        for count in counts:
+            size = comb(left, count)
+            index, sub = divmod(index, size)
+            free = [rank for rank in range(ranks) if not used >> rank & 1]
+            mask = 0
+            for position in _uncolex(sub, count):
+                mask |= 1 << free[position]
+            masks.append(mask)
+            used |= mask
+            left -= count
+        return masks
+
+    def index(self, cards):
+        '''
+        Returns the isomorphism class index of cards (hole cards first, then each round).
+        '''
+        if len(cards) != self.cards:
+            raise ValueError(f"Expected {self.cards} cards, got {len(cards)}")
+
+        masks = [[0] * len(self.rounds) for _ in range(4)]
+        start = 0
+        for r, count in enumerate(self.rounds):
+            for card in cards[start:start + count]:
+                masks[card & 3][r] |= 1 << (card >> 2)
+            start += count
+
+        suits = sorted(((tuple(mask.bit_count() for mask in suit), self._suit_index(suit)) for suit in masks), reverse=True)
+        configuration = tuple(counts for counts, _ in suits)
+        position = self.configuration_keys[self._configuration_key(configuration)]
+
+        total = 0
+        for counts, members in self._groups(configuration):
+            values = [value for suit_counts, value in suits if suit_counts == counts]
+            total = total * comb(self.suit_sizes[counts] + members - 1, members) + _multiset_rank(values)
+        return self.offsets[position] + total
+
+    def unindex(self, index):
+        '''
+        Returns the canonical cards of an isomorphism class index, each round sorted.
+        '''
+        if not 0 <= index < self.size:
+            raise ValueError(f"Index {index} out of range for {self.size} classes")
+
+        position = bisect_right(self.offsets, index) - 1
+        configuration = self.configurations[position]
+        rest = index - self.offsets[position]
+
+        groups = self._groups(configuration)
+        values = []
+        for counts, members in reversed(groups):
+            rest, group_index = divmod(rest, comb(self.suit_sizes[counts] + members - 1, members))
+            values = _multiset_unrank(group_index, members) + values
+
+        rounds = [[] for _ in self.rounds]
+        for suit, (counts, value) in enumerate(zip(configuration, values)):
+            for r, mask in enumerate(self._suit_masks(counts, value)):
+                rounds[r].extend(rank * 4 + suit for rank in range(ranks) if mask >> rank & 1)
+        return [card for cards in rounds for card in sorted(cards)]
+
+    # Vectorized versions
+
+    def _tables(self):
+        if self._batch_tables is None:
+            largest = max(self.suit_sizes.values())
+            small = np.array([[comb(n, k) for k in range(ranks + 1)] for n in range(ranks + 1)], dtype=np.int64)
+            large = np.array([[comb(n, k) for k in range(5)] for n in range(largest + 4)], dtype=np.int64)
+
+            sizes = np.zeros(self.code_base, dtype=np.int64)
+            for counts, size in self.suit_sizes.items():
+                sizes[self._code(counts)] = size
+
+            keys = np.array(sorted(self.configuration_keys), dtype=np.int64)
+            offsets = np.array([self.offsets[self.configuration_keys[key]] for key in keys.tolist()], dtype=np.int64)
+            self._batch_tables = small, large, sizes, keys, offsets, int(largest).bit_length()
+        return self._batch_tables
+
+    # Colex rank and popcount of every 13-bit rank mask
+    _mask_tables = (
+        np.array([_colex([rank for rank in range(ranks) if mask >> rank & 1]) for mask in range(1 << ranks)], dtype=np.int64),
+        np.array([mask.bit_count() for mask in range(1 << ranks)], dtype=np.int64),
+    )
+
+    # Every 13-bit rank mask spread to card bits rank * 4 (suit 0)
+    _spread_table = np.array([sum(1 << (4 * rank) for rank in range(ranks) if mask >> rank & 1) for mask in range(1 << ranks)],
+                             dtype=np.int64)
+
+    def index_batch(self, cards):
+        '''
+        Vectorized index: cards is an (N, cards) array, returns an (N,) int64 array.
+        '''
+        cards = np.asarray(cards, dtype=np.int64)
+        if cards.ndim != 2 or cards.shape[1] != self.cards:
+            raise ValueError(f"Expected an (N, {self.cards}) card array, got shape {cards.shape}")
+        small, large, sizes, keys, offsets, shift = self._tables()
+        n = len(cards)
+        rows = np.arange(n)
+
+        # Per-round rank masks of each suit, (rounds, N, 4)
+        masks = np.zeros((len(self.rounds), n, 4), dtype=np.int64)
+        start = 0
+        for r, count in enumerate(self.rounds):
+            for column in range(start, start + count):
+                masks[r, rows, cards[:, column] & 3] |= 1 << (cards[:, column] >> 2)
+            start += count
+
+        # Colex-rank each round's ranks among those not used by earlier rounds: squeeze the earlier
+        # ranks out of the mask one lowest bit at a time, then look the compressed mask up
+        colex_table, popcount_table = self._mask_tables
+        suit_index = np.zeros((n, 4), dtype=np.int64)
+        multiplier = np.ones((n, 4), dtype=np.int64)
+        left = np.full((n, 4), ranks, dtype=np.int64)
+        code = np.zeros((n, 4), dtype=np.int64)
+        used = np.zeros((n, 4), dtype=np.int64)
+        for r in range(len(self.rounds)):
+            compressed = masks[r]
+            earlier = used
+            for _ in range(min(sum(self.rounds[:r]), ranks)):
+                low = earlier & -earlier
+                below = low - 1
+                compressed = (compressed & below) | ((compressed >> 1) & ~below)
+                earlier = (earlier ^ low) >> 1
+            counts = popcount_table[masks[r]]
+            suit_index += colex_table[compressed] * multiplier
+            multiplier *= small[left, counts]
+            left -= counts
+            code = code * 8 + counts
+            used = used | masks[r]
+
+        # Order suits by (configuration, index), largest first
+        ordered = -np.sort(-((code << shift) | suit_index), axis=1)
+        code = ordered >> shift
+        value = ordered & ((1 << shift) - 1)
+
+        key = np.zeros(n, dtype=np.int64)
+        for position in range(4):
+            key = key * self.code_base + code[:, position]
+        offset = offsets[np.searchsorted(keys, key)]
+
+        # Rank each run of equal configurations as a multiset and combine the runs mixed-radix
+        total = np.zeros(n, dtype=np.int64)
+        for position in range(4):
+            same = code == code[:, position, None]
+            members = same.sum(axis=1)
+            j = same[:, :position].sum(axis=1) + 1
+            group_size = large[sizes[code[:, position]] + members - 1, members]
+            total = np.where(j == 1, total * group_size, total)
+            total += large[value[:, position] + members - j, members - j + 1]
+        return offset + total
+
+    def _unindex_tables(self):
+        if self._unbatch_tables is None:
+            codes = np.array([[self._code(counts) for counts in configuration] for configuration in self.configurations], dtype=np.int64)
+
+            # Compressed rank mask of every colex rank, per number of ranks
+            colex_table, popcount_table = self._mask_tables
+            uncolex = []
+            for count in range(max(self.rounds) + 1):
+                masks = np.flatnonzero(popcount_table == count)
+                uncolex.append(masks[np.argsort(colex_table[masks])])
+            self._unbatch_tables = np.array(self.offsets, dtype=np.int64), codes, uncolex
+        return self._unbatch_tables
+
+    def unindex_batch(self, indices):
+        '''
+        Vectorized unindex: canonical cards for each index, as an (N, cards) int8 array.
+        '''
+        indices = np.asarray(indices, dtype=np.int64).ravel()
+        if np.any((indices < 0) | (indices >= self.size)):
+            raise ValueError(f"Indices out of range for {self.size} classes")
+        small, large, sizes, _, _, _ = self._tables()
+        offsets, codes, uncolex = self._unindex_tables()
+        n = len(indices)
+
+        configuration = np.searchsorted(offsets, indices, side='right') - 1
+        code = codes[configuration]
+        rest = indices - offsets[configuration]
+
+        # Group layout of each row's configuration, as in index_batch
+        same = code[:, :, None] == code[:, None, :]
+        members = same.sum(axis=2)
+        j = np.stack([same[:, position, :position].sum(axis=1) + 1 for position in range(4)], axis=1)
+        group_size = large[sizes[code] + members - 1, members]
+
+        # Split the index into one multiset rank per group, last group first
+        group_index = np.zeros((n, 4), dtype=np.int64)
+        for position in range(3, -1, -1):
+            start = j[:, position] == 1
+            group_index[start, position] = rest[start] % group_size[start, position]
+            rest = np.where(start, rest // group_size[:, position], rest)
+
+        # Unrank each group's multiset: the largest top with comb(top, k) <= what is left, member by member
+        value = np.zeros((n, 4), dtype=np.int64)
+        left_index = np.zeros(n, dtype=np.int64)
+        for position in range(4):
+            left_index = np.where(j[:, position] == 1, group_index[:, position], left_index)
+            k = members[:, position] - j[:, position] + 1
+            top = np.zeros(n, dtype=np.int64)
+            for size in range(1, 5):
+                rows = k == size
+                top[rows] = np.searchsorted(large[:, size], left_index[rows], side='right') - 1
+            left_index -= large[top, k]
+            value[:, position] = top - (members[:, position] - j[:, position])
+
+        # Per-round rank masks of each suit: colex-unrank among the free ranks, then spread the
+        # compressed mask back over them by re-inserting the earlier rounds' ranks lowest first
+        result = np.empty((n, self.cards), dtype=np.int8)
+        used = np.zeros((n, 4), dtype=np.int64)
+        left = np.full((n, 4), ranks, dtype=np.int64)
+        shift = 8 ** len(self.rounds)
+        start = 0
+        for r, round_cards in enumerate(self.rounds):
+            shift //= 8
+            counts = (code // shift) % 8
+            size = small[left, counts]
+            sub = value % size
+            value //= size
+
+            mask = np.zeros((n, 4), dtype=np.int64)
+            for count in range(round_cards + 1):
+                rows = counts == count
+                mask[rows] = uncolex[count][sub[rows]]
+            earlier = used
+            for _ in range(min(sum(self.rounds[:r]), ranks)):
+                low = earlier & -earlier
+                below = low - 1
+                mask = (mask & below) | ((mask & ~below) << 1)
+                earlier = earlier ^ low
+
+            # 52-bit card mask of the round (bit rank * 4 + suit), read off lowest card first so each
+            # round comes out sorted
+            cards = np.zeros(n, dtype=np.int64)
+            for suit in range(4):
+                cards |= self._spread_table[mask[:, suit]] << suit
+            for column in range(start, start + round_cards):
+                low = cards & -cards
+                result[:, column] = np.frexp(low.astype(np.float64))[1] - 1
+                cards ^= low
+
+            used = used | mask
+            left -= counts
+            start += round_cards
+        return result
+
+# One indexer per street, keyed on the number of board cards
+indexers = {0: HandIndexer((2,)), 3: HandIndexer((2, 3)), 4: HandIndexer((2, 4)), 5: HandIndexer((2, 5))}
+
+def canonical_index(hole_cards, board=()):
+    '''
+    Suit-isomorphic index of hole cards and board; only comparable between hands with the same board size.
+    '''
+    return indexers[len(board)].index(list(hole_cards) + list(board))
+
+def canonical_hand(hole_cards, board=()):
+    '''
+    Canonical representative (hole_cards, board) of the isomorphism class of hole cards and board.
+    '''
+    cards = indexers[len(board)].unindex(canonical_index(hole_cards, board))
+    return cards[:2], cards[2:]
+
+def canonical_index_batch(hole_cards, board=None):
+    '''
+    Vectorized canonical_index: hole_cards is (N, 2) and board is (N, 0/3/4/5) or None.
+    '''
+    cards = np.asarray(hole_cards) if board is None else np.hstack([hole_cards, board])
+    return indexers[cards.shape[1] - 2].index_batch(cards)
+
+def canonical_key(hole_cards, board=()):
+    '''
+    Hashable key of the isomorphism class of hole cards and board, cheaper than canonical_index.
+
+    Each suit is reduced to its (hole rank mask, board rank mask) pair and the four pairs are
+    sorted, so hands that only differ by a permutation of suits get the same key.
+    '''
+    hole_masks = [0, 0, 0, 0]
+    board_masks = [0, 0, 0, 0]
+    for card in hole_cards:
+        hole_masks[card & 3] |= 1 << (card >> 2)
+    for card in board:
+        board_masks[card & 3] |= 1 << (card >> 2)
+    return tuple(sorted(zip(hole_masks, board_masks)))
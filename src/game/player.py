@@ -1,9 +1,5 @@
 # players.py
 
-import re
-
-from pokereval.card import Card
-
 import game.game_logic as gl
 import game.config as cg
 import game.cards as gc
@@ -16,18 +12,23 @@ class Player:
 
     Contains:
         The name of the player.
-        The list of cards in their hand
+        The list of cards in their hand (integer cards, see game.cards)
     '''
 
+    __slots__ = ("name", "hole_cards", "hand", "hand_strength", "hand_rank", "hand_description", "chipcount",
+                 "bet", "contributed", "folded", "all_in", "round_played", "game_in_play")
+
     def __init__(self, name: str):
         self.name = name
         self.hole_cards = []
         self.hand = []
-        self.hand_strength = 0.0
+        self.hand_strength = 0.0  # Between 0 and 1: pre-flop equity, then the hand rank scaled
+        self.hand_rank = 0  # game.evaluator rank once five cards are out, 0 before
         self.hand_description = ""
         self.chipcount = cg.chipcount
 
         self.bet = 0
+        self.contributed = 0  # Chips put into the pot this hand
         self.folded = False
         self.all_in = False
         self.round_played = False
@@ -40,12 +41,22 @@ class Player:
 
     def reset_round(self):
         self.reset_betting()
+        self.contributed = 0
         self.reset_hand()
         self.folded = False
         self.all_in = False
         self.round_played = False
 
-    def receive_card(self, card: Card):
+    def reset_game(self):
+        '''
+        Back to the start of a game: starting stack, in play, no cards or bets
+        '''
+        self.reset_round()
+        self.hole_cards = []
+        self.chipcount = cg.chipcount
+        self.game_in_play = True
+
+    def receive_card(self, card: int):
         ''' 
         Receives a single card appended to the hand list
         '''
@@ -69,13 +80,15 @@ class Player:
         '''
         self.hand = []
         self.hand_strength = 0.0
+        self.hand_rank = 0
         self.hand_description = ""
 
-    def set_hand_info(self, hand_strength, hand_description):
+    def set_hand_info(self, hand_strength, hand_description, hand_rank=0):
         '''
-        Sets the hand strength and description
+        Sets the hand strength, description and rank
         '''
         self.hand_strength = hand_strength
+        self.hand_rank = hand_rank
         self.hand_description = hand_description
 
     def __str__ (self):
@@ -0,0 +1,156 @@
+# preflop.py
+
+import os
+
+import numpy as np
+
+from game.cards import deck_size, card_rank, card_suit, deal_batch_rows, spawn_rngs
+from game.evaluator import evaluate_batch
+from game.equity import rollout_chunk
+import game.config as cg
+
+# Pre-flop equity tables
+#
+# Pre-flop equity only depends on the 169 canonical starting hands, so it is computed once by
+# build_tables() (run `python -m game.preflop`) and stored in config.table_dir as two float32 .npy files:
+#   preflop_vs_random.npy (169, max_opponents): equity against 1..max_opponents random hands
+#   preflop_vs_hand.npy   (169, 169):           equity of hand i against hand j
+# Both are memory-mapped at import, so a lookup is one array index.
+#
+# A starting hand's index is 13 * a + b on the 13x13 grid of rank indices (deuce = 0):
+# pairs on the diagonal, suited hands with a > b and offsuit hands with a < b.
+
+max_opponents = 9
+starting_hands = 169
+
+rank_letters = "23456789TJQKA"
+
+def _grid_index(first, second):
+    high, low = max(card_rank[first], card_rank[second]) - 2, min(card_rank[first], card_rank[second]) - 2
+    if card_suit[first] == card_suit[second]:
+        return 13 * high + low
+    return 13 * low + high
+
+# Index of every two-card hand, hand_index[first, second]
+hand_index = np.full((deck_size, deck_size), -1, dtype=np.int16)
+for _first in range(deck_size):
+    for _second in range(deck_size):
+        if _first != _second:
+            hand_index[_first, _second] = _grid_index(_first, _second)
+
+def starting_hand(hole_cards):
+    '''
+    Returns the 0-168 index of two hole cards.
+    '''
+    return int(hand_index[hole_cards[0], hole_cards[1]])
+
+def starting_hand_name(index):
+    '''
+    Returns the usual name of a starting hand index, e.g. "AA", "AKs" or "72o".
+    '''
+    a, b = divmod(index, 13)
+    if a == b:
+        return rank_letters[a] * 2
+    if a > b:
+        return rank_letters[a] + rank_letters[b] + "s"
+    return rank_letters[b] + rank_letters[a] + "o"
+
+def starting_hand_combos():
+    '''
+    Returns a list of the concrete (card, card) combos of each starting hand index.
+    '''
+    combos = [[] for _ in range(starting_hands)]
+    for first in range(deck_size):
+        for second in range(first + 1, deck_size):
+            combos[hand_index[first, second]].append((first, second))
+    return combos
+
+def _matchup_chunk(first, second, combos, counts, samples, rng):
+    '''
+    Monte Carlo equity of starting hands first[k] vs second[k] over samples boards each.
+    '''
+    rows = np.repeat(np.arange(len(first)), samples)
+    hero = combos[first[rows], (rng.random(len(rows)) * counts[first[rows]]).astype(np.intp)]
+    villain = combos[second[rows], (rng.random(len(rows)) * counts[second[rows]]).astype(np.intp)]
+
+    known = np.sort(np.hstack([hero, villain]), axis=1)
+    valid = np.all(known[:, 1:] != known[:, :-1], axis=1)
+    rows, hero, villain, known = rows[valid], hero[valid], villain[valid], known[valid]
+
+    board = deal_batch_rows(known, 5, rng)
+
+    hero_rank, _ = evaluate_batch(np.hstack([hero, board]))
+    villain_rank, _ = evaluate_batch(np.hstack([villain, board]))
+    share = (hero_rank > villain_rank) + 0.5 * (hero_rank == villain_rank)
+    return np.bincount(rows, share, len(first)) / np.bincount(rows, minlength=len(first))
+
+def build_tables(samples=20000, random_samples=50000, seed=0):
+    '''
+    Computes the pre-flop equity tables by Monte Carlo.
+
+    Returns (vs_random, vs_hand). samples is the number of boards per hand-vs-hand matchup,
+    random_samples the number of rollouts per hand and opponent count.
+    '''
+    rng_random, rng_hand = spawn_rngs(2, seed)
+    combos_by_hand = starting_hand_combos()
+
+    vs_random = np.zeros((starting_hands, max_opponents), dtype=np.float32)
+    for index, hand_combos in enumerate(combos_by_hand):
+        for opponents in range(1, max_opponents + 1):
+            share, _, _, _, n = rollout_chunk(hand_combos[0], [], [], opponents, None, random_samples, rng_random)
+            vs_random[index, opponents - 1] = share / n
+
+    counts = np.array([len(hand_combos) for hand_combos in combos_by_hand])
+    combos = np.zeros((starting_hands, counts.max(), 2), dtype=np.int8)
+    for index, hand_combos in enumerate(combos_by_hand):
+        combos[index, :len(hand_combos)] = hand_combos
+
+    vs_hand = np.full((starting_hands, starting_hands), 0.5, dtype=np.float32)
+    first, second = np.triu_indices(starting_hands, k=1)
+    chunk = max(1, 2_000_000 // samples)
+    for start in range(0, len(first), chunk):
+        part = slice(start, start + chunk)
+        equity = _matchup_chunk(first[part], second[part], combos, counts, samples, rng_hand)
+        vs_hand[first[part], second[part]] = equity
+        vs_hand[second[part], first[part]] = 1 - equity
+
+    return vs_random, vs_hand
+
+table_names = ["vs_random", "vs_hand"]
+
+def save_tables(tables, table_dir=cg.table_dir):
+    os.makedirs(table_dir, exist_ok=True)
+    for name, table in zip(table_names, tables):
+        np.save(os.path.join(table_dir, f"preflop_{name}.npy"), table)
+
+def load_tables(table_dir=cg.table_dir):
+    '''
+    Memory-maps the pre-flop tables from table_dir, building and saving them first if they are missing.
+    '''
+    paths = [os.path.join(table_dir, f"preflop_{name}.npy") for name in table_names]
+    if not all(os.path.exists(path) for path in paths):
+        tables = build_tables()
+        try:
+            save_tables(tables, table_dir)
+        except OSError:
+            return tables  # Read-only install: keep the tables in memory only
+    return [np.load(path, mmap_mode='r') for path in paths]
+
+if __name__ != "__main__":
+    vs_random, vs_hand = load_tables()
+
+def preflop_equity(hole_cards, opponents=1):
+    '''
+    Equity of two hole cards against opponents random hands.
+    '''
+    return float(vs_random[hand_index[hole_cards[0], hole_cards[1]], opponents - 1])
+
+def preflop_matchup(hole_cards, other_cards):
+    '''
+    Equity of one starting hand against another, averaged over their suit combinations.
+    '''
+    return float(vs_hand[hand_index[hole_cards[0], hole_cards[1]], hand_index[other_cards[0], other_cards[1]]])
+
+if __name__ == "__main__":
+    # Build step: recompute and overwrite the tables
+    save_tables(build_tables())
@@ -0,0 +1,185 @@
+# replay.py
+
+import sys
+import time
+
+from game.actions import ScriptedProvider, CHECK_CALL, BET_RAISE, FOLD
+from game.cards import deck_size
+from game.game_logic import GameLogic
+from game.history import HandHistoryReader
+from game.results import Results
+from game.runner import play_hand
+import game.config as cg
+
+# Hand-history replay
+#
+# Re-plays recorded hands (game.results.Results, e.g. from a game.history file) through GameLogic
+# with no console, events or rendering: the seating, positions, stacks and cards of each hand are
+# set up as recorded, the deck is stacked to deal the recorded cards, and every seat replays its
+# recorded decisions. The replayed hand is recorded again and compared with the original, so any
+# change to the engine or evaluator that alters a pot, a payout or a showdown hand rank is caught
+# at the first hand it affects.
+#
+# `python -m game.replay hands.rlph` replays a whole file and exits with status 1 on a divergence.
+
+# Provider action of a recorded action code
+recorded_actions = {0: CHECK_CALL, 1: BET_RAISE, 2: FOLD}
+
+class Divergence:
+    '''
+    First difference found in a replayed hand: field is "actions", "pot", "payouts" or "ranks".
+    '''
+
+    def __init__(self, hand, field, expected, actual):
+        self.hand = hand
+        self.field = field
+        self.expected = expected
+        self.actual = actual
+
+    def __repr__(self):
+        return f"Divergence(hand={self.hand}, {self.field}: expected {self.expected!r}, got {self.actual!r})"
+
+class ReplayProvider(ScriptedProvider):
+    '''
+    Replays one seat's recorded decisions. score(game, player, highest_bet, action), if given, sees
+    every decision point with the recorded action before it is played, e.g. to rate a new agent on it.
+    '''
+
+    def __init__(self, score=None):
+        super().__init__([])
+        self.score = score
+
+    def load(self, script):
+        self.script = script
+        self.position = 0
+
+    def action(self, game, player, highest_bet):
+        if self.score is not None:
+            self.score(game, player, highest_bet, self.script[self.position])
+        return super().action(game, player, highest_bet)
+
+def deal_order(results):
+    '''
+    Cards in the order GameLogic deals them for a recorded hand: hole cards round the table twice,
+    then the board with a burn card before each street. Burn cards are not recorded, so unused
+    cards stand in for them.
+    '''
+    in_play = [hand for hand in results.hands if hand]
+    order = [hand[0] for hand in in_play] + [hand[1] for hand in in_play]
+    board = results.community_cards
+    if not board:
+        return order
+
+    used = set(order) | set(board)
+    burns = [card for card in range(deck_size) if card not in used][:3]
+    order += [burns[0]] + board[:3]
+    for burn, card in zip(burns[1:], board[3:]):
+        order += [burn, card]
+    return order
+
+class Replayer:
+    '''
+    Replays hands on one reused headless table whose players are names (config.agents by default).
+    '''
+
+    def __init__(self, names=None, score=None):
+        names = list(cg.agents if names is None else names)
+        if names != list(cg.agents):
+            raise ValueError(f"Hands of {names} cannot be replayed at a table of {cg.agents}")
+        self.game = GameLogic(0, [ReplayProvider(score) for _ in names])
+        self.game.results = Results()
+        self.players = {player.name: player for player in self.game.seats}
+
+    def setup(self, results):
+        '''
+        Puts the table at the start of the recorded hand, with each seat's decisions scripted.
+        '''
+        game = self.game
+        game.players[:] = [self.players[name] for name in results.players]
+        seats = len(game.players)
+        game.dealer_index = results.dealer
+        game.small_blind_index = (results.dealer + 1) % seats
+        game.big_blind_index = (results.dealer + 2) % seats
+        game.active_player_index = results.active
+        game.pot = game.current_bet = game.betting_round_pot = 0
+        game.community_cards.reset()
+
+        scripts = [[] for _ in range(seats)]
+        for seat, _, action, amount in results.decisions:
+            scripts[seat].append((BET_RAISE, amount) if action == 1 else recorded_actions[action])
+
+        for player, hand, stack, script in zip(game.players, results.hands, results.stacks, scripts):
+            player.reset_round()
+            player.chipcount = stack
+            player.game_in_play = bool(hand)
+            game.hand_states[player].reset()
+            game.providers[player].load(script)
+
+        game.deck.reset()
+        game.deck.stack(deal_order(results))
+
+    def replay_hand(self, results, hand=0):
+        '''
+        Replays one recorded hand. Returns the first Divergence, or None if the replay matches.
+        '''
+        self.setup(results)
+        replayed = self.game.results
+        try:
+            play_hand(self.game)
+        except (IndexError, ValueError) as error:
+            return Divergence(hand, "actions", results.decisions, f"{type(error).__name__}: {error}")
+
+        if replayed.decisions != list(results.decisions):
+            return Divergence(hand, "actions", list(results.decisions), replayed.decisions)
+        if sum(replayed.payouts) != sum(results.payouts):
+            return Divergence(hand, "pot", sum(results.payouts), sum(replayed.payouts))
+        if replayed.payouts != list(results.payouts):
+            return Divergence(hand, "payouts", list(results.payouts), replayed.payouts)
+        if replayed.ranks != list(results.ranks):
+            return Divergence(hand, "ranks", list(results.ranks), replayed.ranks)
+        return None
+
+    def run(self, hands, stop=True):
+        '''
+        Replays an iterable of Results and returns a ReplayReport. With stop, the replay ends at the
+        first divergence; otherwise every divergent hand is reported.
+        '''
+        report = ReplayReport()
+        start = time.perf_counter()
+        for index, results in enumerate(hands):
+            divergence = self.replay_hand(results, index)
+            report.hands += 1
+            if divergence is not None:
+                report.divergences.append(divergence)
+                if stop:
+                    break
+        report.seconds = time.perf_counter() - start
+        return report
+
+class ReplayReport:
+    def __init__(self):
+        self.hands = 0
+        self.divergences = []
+        self.seconds = 0.0
+
+    @property
+    def first_divergence(self):
+        return self.divergences[0] if self.divergences else None
+
+    def __repr__(self):
+        rate = self.hands / self.seconds if self.seconds else 0.0
+        return (f"ReplayReport(hands={self.hands}, divergences={len(self.divergences)}, "
+                f"first={self.first_divergence!r}, {rate:.0f} hands/s)")
+
+def replay(path, stop=True, score=None):
+    '''
+    Replays every hand of a game.history file. Returns the ReplayReport.
+    '''
+    with HandHistoryReader(path) as reader:
+        return Replayer(reader.names, score).run(reader.results(), stop)
+
+if __name__ == "__main__":
+    # python -m game.replay <history file>
+    report = replay(sys.argv[1])
+    print(report)
+    sys.exit(1 if report.divergences else 0)
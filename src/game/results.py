@@ -1,5 +1,8 @@
 # results.py
 
+# Street of a decision, by the number of community cards out
+streets = {0: 0, 3: 1, 4: 2, 5: 3}
+
 class Results:
     '''
     Stores the players' names, hands, and bets.
@@ -8,6 +11,9 @@ class Results:
     Stores Hand Winner.
     Can be used for analysis of performance.
 
+    A GameLogic with results set fills it in as the hand is played (see start_hand): everything is
+    by seat in table order, with decisions as (seat, street, action, amount) where action is 0
+    check/call, 1 bet/raise or 2 fold and amount the chips it put in. game.history stores them.
     '''
 
     def __init__(self):
@@ -16,6 +22,40 @@ class Results:
         self.decisions = []
         self.hand_winner = None
 
+        self.hands = []
+        self.stacks = []
+        self.dealer = 0
+        self.active = 0
+        self.payouts = []
+        self.net = []
+        self.ranks = []
+
+    def start_hand(self, game):
+        '''
+        Starts recording a hand of game once the hole cards are dealt (before the blinds).
+        '''
+        self.players = [player.name for player in game.players]
+        self.hands = [list(player.hand) for player in game.players]
+        self.stacks = [player.chipcount for player in game.players]
+        self.dealer = game.dealer_index
+        self.active = game.active_player_index
+        self.community_cards = []
+        self.decisions = []
+        self.payouts = []
+        self.net = []
+        self.ranks = []
+        self.hand_winner = None
+
+    def end_hand(self, payouts, contributed, ranks):
+        '''
+        Records the chips each seat won and put in, the hand rank (game.evaluator) of every seat
+        still in the hand on a full board (0 otherwise), and the biggest winner as the hand winner.
+        '''
+        self.payouts = list(payouts)
+        self.ranks = list(ranks)
+        self.net = [won - amount for won, amount in zip(payouts, contributed)]
+        self.hand_winner = self.players[max(range(len(self.net)), key=self.net.__getitem__)]
+
     def add_player(self, player):
         self.players.append(player)
 
@@ -25,6 +65,9 @@ class Results:
     def add_decision(self, decision):
         self.decisions.append(decision)
 
+    def add_action(self, seat, action, amount):
+        self.decisions.append((seat, streets[len(self.community_cards)], int(action), amount))
+
     def set_hand_winner(self, player):
         self.hand_winner = player
 
@@ -46,4 +89,4 @@ class Results:
             'community_cards': self.community_cards,
             'decisions': self.decisions,
             'hand_winner': self.hand_winner
-        }
\ No newline at end of file
+        }
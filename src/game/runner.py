@@ -0,0 +1,147 @@
+# runner.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from game.actions import RandomProvider
+from game.cards import spawn_rngs
+from game.game_logic import GameLogic
+from game.results import Results
+import game.config as cg
+
+# Headless play
+#
+# Drives GameLogic through complete hands in a tight loop, with every seat played by an action
+# provider (game.actions) instead of the console or the GUI.
+#
+# run_matches() spreads many independent tables over a process pool. Every table is played in
+# segments of chunk_hands hands, each a fresh GameLogic with its own random stream, and each
+# segment's per-hand results come back to the parent as soon as it finishes.
+
+def play_hand(game):
+    '''
+    Plays one complete hand on game and starts the next one.
+
+    Returns {player name: net chips won} for the hand.
+    '''
+    start = {player.name: player.chipcount for player in game.players}
+
+    game.deal_hole_cards()
+    game.pre_flop()
+    for deal, betting in ((game.flop, game.pre_turn), (game.turn, game.pre_river), (game.river, game.showdown)):
+        in_hand = game.players_in_hand()
+        if len(in_hand) <= 1:
+            break
+        deal()
+        # No betting once at most one player in the hand still has chips behind
+        if sum(1 for player in in_hand if not player.all_in) >= 2:
+            betting()
+
+    # Chips each player put in, before the pot is paid out (and before a finished game resets the table)
+    contributed = {player.name: start[player.name] - player.chipcount for player in game.players}
+    game.end_round()
+    game.new_round()
+    return {name: game.payouts.get(name, 0) - amount for name, amount in contributed.items()}
+
+def play_match(providers, hands, rng=None, history=None):
+    '''
+    Plays hands hands on a new table whose seats are played by providers (one per config.agents entry).
+    Every hand is recorded to history, a game.history.HandHistoryWriter, if given.
+
+    Returns (totals, game): the net chips won by each player name over the match and the table.
+    '''
+    game = GameLogic(rng, providers)
+    if history is not None:
+        game.results = Results()
+    totals = {player.name: 0 for player in game.players}
+    for _ in range(hands):
+        for name, net in play_hand(game).items():
+            totals[name] += net
+        if history is not None:
+            history.write(game.results)
+    return totals, game
+
+def random_providers(seed):
+    '''
+    One RandomProvider per config.agents entry, the default players of run_matches.
+    '''
+    return [RandomProvider(rng) for rng in spawn_rngs(len(cg.agents), seed)]
+
+def play_segment(make_providers, hands, seed):
+    '''
+    Plays hands hands on a new table seeded from the SeedSequence seed and returns an (hands, len(config.agents)) array of the net
+    chips won by each agent (in config.agents order) in each hand.
+    '''
+    table_seed, provider_seed = seed.spawn(2)
+    results = np.zeros((hands, len(cg.agents)), dtype=np.float64)
+    game = GameLogic(table_seed, make_providers(provider_seed))
+    for hand in range(hands):
+        net = play_hand(game)
+        results[hand] = [net[name] for name in cg.agents]
+    return results
+
+class MatchResults:
+    '''
+    Running totals over all hands played so far, by agent name.
+    '''
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.hands = 0
+        self.chips = np.zeros(len(self.names))
+        self.wins = np.zeros(len(self.names), dtype=np.int64)
+
+    def add(self, results):
+        self.hands += len(results)
+        self.chips += results.sum(axis=0)
+        self.wins += (results > 0).sum(axis=0)
+
+    def win_rates(self):
+        '''
+        Share of hands each agent won chips in.
+        '''
+        return dict(zip(self.names, (self.wins / max(self.hands, 1)).tolist()))
+
+    def big_blinds_per_100(self):
+        return dict(zip(self.names, (100 * self.chips / cg.big_blind / max(self.hands, 1)).tolist()))
+
+    def __repr__(self):
+        return f"MatchResults(hands={self.hands}, chips={dict(zip(self.names, self.chips.tolist()))})"
+
+def run_matches(tables, hands, make_providers=random_providers, processes=None, chunk_hands=1000,
+                seed=None, on_result=None):
+    '''
+    Plays hands hands at each of tables independent tables across a process pool (processes=0 plays
+    them in the calling process) and returns the MatchResults.
+
+    make_providers(seed) returns the seat providers of one table from a SeedSequence and must be
+    picklable (a module-level function). on_result(table, results), if given, is called in the parent with each segment's
+    per-hand results as they arrive.
+    '''
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    segments = []
+    for table, table_seed in enumerate(seed_sequence.spawn(tables)):
+        sizes = [min(chunk_hands, hands - start) for start in range(0, hands, chunk_hands)]
+        segments.extend((table, size, segment_seed) for size, segment_seed in zip(sizes, table_seed.spawn(len(sizes))))
+
+    totals = MatchResults(cg.agents)
+
+    def collect(table, results):
+        totals.add(results)
+        if on_result is not None:
+            on_result(table, results)
+
+    processes = processes if processes is not None else os.cpu_count()
+    if processes == 0:
+        for table, size, segment_seed in segments:
+            collect(table, play_segment(make_providers, size, segment_seed))
+        return totals
+
+    with ProcessPoolExecutor(processes) as pool:
+        futures = {pool.submit(play_segment, make_providers, size, segment_seed): table
+                   for table, size, segment_seed in segments}
+        for future in as_completed(futures):
+            collect(futures[future], future.result())
+    return totals
@@ -0,0 +1,192 @@
+# search.py
+
+from game.actions import CHECK_CALL, BET_RAISE, FOLD, BetMenu
+from game.evaluator import evaluate
+from game.state import GameState, no_card
+from game.showdown import side_pots, award
+
+# Search twin of GameLogic
+#
+# SearchGame plays the GameLogic betting rules on one GameState that is mutated in place:
+# legal_actions() lists the moves at the current node, apply(action) makes one and undo() takes
+# the last one back. Each apply pushes a small tuple of the values it overwrote onto an undo stack,
+# so a depth-first traversal never copies the state.
+#
+# Actions are CHECK_CALL, FOLD or (BET_RAISE, amount) as in game.actions, with the raises offered by a
+# game.actions.BetMenu (legal_mask() gives its mask for the seat to act). Dealing the flop, turn and
+# river are chance nodes (to_act == CHANCE) whose actions are the undealt cards, one card per apply.
+
+CHANCE = -1
+TERMINAL = -2
+
+class SearchGame:
+    __slots__ = ("state", "to_act", "board_count", "history", "menu")
+
+    def __init__(self, state, to_act=None, menu=None):
+        self.state = state
+        self.menu = menu or BetMenu()
+        self.board_count = sum(1 for card in state.board if card != no_card)
+        self.history = []
+        self.to_act = self._first_to_act() if to_act is None else to_act
+
+    @classmethod
+    def from_game(cls, game):
+        '''
+        Search state for a GameLogic at the start of a betting round.
+        '''
+        return cls(GameState.from_game(game))
+
+    # Rules
+
+    def _can_act(self, seat):
+        state = self.state
+        return state.in_play[seat] and not state.folded[seat] and not state.all_in[seat]
+
+    def in_hand(self):
+        state = self.state
+        return [seat for seat in range(state.seats) if state.in_play[seat] and not state.folded[seat]]
+
+    def _needs_action(self, seat, highest_bet):
+        return self._can_act(seat) and (not self.state.round_played[seat] or self.state.bets[seat] < highest_bet)
+
+    def _first_to_act(self):
+        state = self.state
+        if len(self.in_hand()) <= 1:
+            return TERMINAL
+
+        # Betting only happens while two players can act, or one still owes chips
+        highest_bet = max(state.bets)
+        acting = [seat for seat in range(state.seats) if self._can_act(seat)]
+        if len(acting) >= 2 or any(state.bets[seat] < highest_bet for seat in acting):
+            for step in range(state.seats):
+                seat = (state.active_player_index + step) % state.seats
+                if self._needs_action(seat, highest_bet):
+                    return seat
+        return CHANCE if self.board_count < 5 else TERMINAL
+
+    def _next_to_act(self, seat):
+        state = self.state
+        if len(self.in_hand()) <= 1:
+            return None
+        highest_bet = max(state.bets)
+        for step in range(1, state.seats + 1):
+            other = (seat + step) % state.seats
+            if self._needs_action(other, highest_bet):
+                return other
+        return None
+
+    def is_terminal(self):
+        return self.to_act == TERMINAL
+
+    def is_chance(self):
+        return self.to_act == CHANCE
+
+    def legal_actions(self):
+        state = self.state
+        if self.to_act == TERMINAL:
+            return []
+        if self.to_act == CHANCE:
+            return state.deck[:state.deck_remaining]
+
+        # Menu slots that come to the same amount are one move in the tree
+        mask, amounts = self.legal_mask()
+        return list(dict.fromkeys(self.menu.action(slot, amounts) for slot in range(self.menu.size) if mask[slot]))
+
+    def legal_mask(self):
+        '''
+        (mask, amounts) of the bet menu for the seat to act.
+        '''
+        state = self.state
+        seat = self.to_act
+        return self.menu.options(state.pot + state.betting_round_pot, max(state.bets) - state.bets[seat], state.chips[seat])
+
+    def apply(self, action):
+        state = self.state
+        seat = self.to_act
+
+        if seat == CHANCE:
+            # Deal action onto the board, moving it past the undealt part of the deck
+            position = state.deck.index(action, 0, state.deck_remaining)
+            last = state.deck_remaining - 1
+            state.deck[position], state.deck[last] = state.deck[last], state.deck[position]
+            state.deck_remaining = last
+            state.board[self.board_count] = action
+            self.board_count += 1
+            self.history.append((CHANCE, position, seat))
+            if self.board_count >= 3:
+                self.to_act = self._first_to_act()
+            return
+
+        if seat == TERMINAL:
+            raise ValueError("The hand is over")
+
+        record = (seat, state.bets[seat], state.contributed[seat], state.chips[seat], state.folded[seat],
+                  state.all_in[seat], state.round_played[seat], state.betting_round_pot)
+
+        if action == FOLD:
+            state.folded[seat] = True
+        else:
+            if action == CHECK_CALL:
+                amount = min(max(state.bets) - state.bets[seat], state.chips[seat])
+            else:
+                code, amount = action
+                if code != BET_RAISE or state.bets[seat] + amount < max(state.bets) or amount > state.chips[seat]:
+                    raise ValueError(f"Illegal action {action!r} for seat {seat}")
+            state.bets[seat] += amount
+            state.contributed[seat] += amount
+            state.chips[seat] -= amount
+            state.betting_round_pot += amount
+            if state.chips[seat] == 0:
+                state.all_in[seat] = True
+        state.round_played[seat] = True
+
+        following = self._next_to_act(seat)
+        if following is not None:
+            self.history.append((seat, record, None))
+            self.to_act = following
+            return
+
+        # Betting round over: collect it into the pot and reset the bets, as GameLogic.betting_round does
+        closed = (state.pot, state.bets[:], state.round_played[:])
+        state.pot += state.betting_round_pot
+        state.betting_round_pot = 0
+        for other in range(state.seats):
+            state.bets[other] = 0
+            state.round_played[other] = False
+        self.history.append((seat, record, closed))
+        self.to_act = TERMINAL if len(self.in_hand()) <= 1 or self.board_count == 5 else CHANCE
+
+    def undo(self):
+        state = self.state
+        kind, first, second = self.history.pop()
+
+        if kind == CHANCE:
+            self.board_count -= 1
+            state.board[self.board_count] = no_card
+            last = state.deck_remaining
+            state.deck[first], state.deck[last] = state.deck[last], state.deck[first]
+            state.deck_remaining = last + 1
+            self.to_act = CHANCE
+            return
+
+        if second is not None:
+            state.pot, state.bets[:], state.round_played[:] = second
+        seat = kind
+        (_, state.bets[seat], state.contributed[seat], state.chips[seat], state.folded[seat],
+         state.all_in[seat], state.round_played[seat], state.betting_round_pot) = first
+        self.to_act = seat
+
+    def payouts(self):
+        '''
+        Chips each seat wins from the pot at a terminal node.
+        '''
+        state = self.state
+        in_hand = self.in_hand()
+        live = [False] * state.seats
+        keys = [None] * state.seats
+        board = state.board[:self.board_count]
+        for seat in in_hand:
+            live[seat] = True
+            keys[seat] = evaluate(state.hands[2 * seat:2 * seat + 2] + board)[0] if len(in_hand) > 1 else 0
+        pots = side_pots(state.contributed, live)
+        return award(pots, keys, (state.dealer_index + 1) % state.seats)
@@ -0,0 +1,51 @@
+# showdown.py
+
+# Showdown with side pots
+#
+# Each player's contribution to the hand is tracked separately. side_pots() sorts the seats by
+# contribution once and sweeps up through the levels: every seat still in the hand closes a pot at
+# its contribution level, holding the chips every seat put in between the previous level and this
+# one. award() then pays each pot to the best hand among the seats eligible for it.
+
+def side_pots(contributions, in_hand):
+    '''
+    Splits the chips put in by every seat into a main pot and side pots.
+
+    contributions[seat] is the chips seat put into the hand and in_hand[seat] whether it can still
+    win. Returns [(amount, eligible seats)], main pot first.
+    '''
+    order = sorted(range(len(contributions)), key=contributions.__getitem__)
+    pots = []
+    amount = previous = 0
+    for position, seat in enumerate(order):
+        level = contributions[seat]
+        amount += (level - previous) * (len(order) - position)
+        previous = level
+        if in_hand[seat] and amount:
+            pots.append((amount, [other for other in order[position:] if in_hand[other]]))
+            amount = 0
+
+    # Chips from folded seats above every live contribution go to the last pot. When no seat still
+    # in the hand put anything in (everyone folds to a player yet to act), they are the only pot.
+    if amount:
+        if pots:
+            pots[-1] = (pots[-1][0] + amount, pots[-1][1])
+        else:
+            pots.append((amount, [seat for seat in order if in_hand[seat]]))
+    return pots
+
+def award(pots, keys, first_seat=0):
+    '''
+    Pays out pots to the best hands. keys[seat] is a comparable hand key (higher wins) for every
+    eligible seat. Tied winners split a pot evenly; odd chips go to the winners closest to the left
+    of first_seat. Returns the chips won by each seat.
+    '''
+    seats = len(keys)
+    payouts = [0] * seats
+    for amount, eligible in pots:
+        best = max(keys[seat] for seat in eligible)
+        winners = sorted((seat for seat in eligible if keys[seat] == best), key=lambda seat: (seat - first_seat) % seats)
+        share, odd = divmod(amount, len(winners))
+        for position, seat in enumerate(winners):
+            payouts[seat] += share + (1 if position < odd else 0)
+    return payouts
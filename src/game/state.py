@@ -0,0 +1,150 @@
+# state.py
+
+from game.cards import deck_size
+
+# Compact game state
+#
+# GameState holds everything that changes during a hand as flat lists of ints and bools, one
+# entry per seat in table order, with integer cards and -1 for a card not dealt yet. clone() copies
+# those lists and nothing else, so search and rollouts can branch a state in microseconds.
+# from_game() / restore() convert to and from a live GameLogic with the same seats.
+
+no_card = -1
+
+class GameState:
+    __slots__ = ("chips", "bets", "contributed", "folded", "all_in", "round_played", "in_play", "hands", "board",
+                 "pot", "betting_round_pot", "dealer_index", "small_blind_index", "big_blind_index",
+                 "active_player_index", "deck", "deck_remaining")
+
+    def __init__(self, seats):
+        self.chips = [0] * seats
+        self.bets = [0] * seats
+        self.contributed = [0] * seats
+        self.folded = [False] * seats
+        self.all_in = [False] * seats
+        self.round_played = [False] * seats
+        self.in_play = [True] * seats
+        self.hands = [no_card] * (2 * seats)  # Seat i holds hands[2 * i] and hands[2 * i + 1]
+        self.board = [no_card] * 5
+        self.pot = 0
+        self.betting_round_pot = 0
+        self.dealer_index = 0
+        self.small_blind_index = 0
+        self.big_blind_index = 0
+        self.active_player_index = 0
+        self.deck = list(range(deck_size))
+        self.deck_remaining = deck_size
+
+    @property
+    def seats(self):
+        return len(self.chips)
+
+    @property
+    def street(self):
+        '''
+        0-3 for pre-flop, flop, turn and river (the keys of GameLogic.game_states).
+        '''
+        dealt = sum(1 for card in self.board if card != no_card)
+        return max(dealt - 2, 0)
+
+    def clone(self):
+        other = GameState.__new__(GameState)
+        other.chips = self.chips[:]
+        other.bets = self.bets[:]
+        other.contributed = self.contributed[:]
+        other.folded = self.folded[:]
+        other.all_in = self.all_in[:]
+        other.round_played = self.round_played[:]
+        other.in_play = self.in_play[:]
+        other.hands = self.hands[:]
+        other.board = self.board[:]
+        other.pot = self.pot
+        other.betting_round_pot = self.betting_round_pot
+        other.dealer_index = self.dealer_index
+        other.small_blind_index = self.small_blind_index
+        other.big_blind_index = self.big_blind_index
+        other.active_player_index = self.active_player_index
+        other.deck = self.deck[:]
+        other.deck_remaining = self.deck_remaining
+        return other
+
+    __copy__ = clone
+
+    @classmethod
+    def from_game(cls, game):
+        '''
+        Snapshot of a GameLogic's current state.
+        '''
+        state = cls(len(game.players))
+        for seat, player in enumerate(game.players):
+            state.chips[seat] = player.chipcount
+            state.bets[seat] = player.bet
+            state.contributed[seat] = player.contributed
+            state.folded[seat] = player.folded
+            state.all_in[seat] = player.all_in
+            state.round_played[seat] = player.round_played
+            state.in_play[seat] = player.game_in_play
+            state.hands[2 * seat:2 * seat + len(player.hand)] = player.hand
+        board = game.community_cards.cards()
+        state.board[:len(board)] = board
+        state.pot = game.pot
+        state.betting_round_pot = game.betting_round_pot
+        state.dealer_index = game.dealer_index
+        state.small_blind_index = game.small_blind_index
+        state.big_blind_index = game.big_blind_index
+        state.active_player_index = game.active_player_index
+        state.deck = game.deck.cards[:]
+        state.deck_remaining = game.deck.remaining
+        return state
+
+    def restore(self, game):
+        '''
+        Writes this state back into game, a GameLogic with the same seats.
+        '''
+        if len(game.players) != self.seats:
+            raise ValueError(f"State has {self.seats} seats, game has {len(game.players)}")
+
+        for seat, player in enumerate(game.players):
+            player.chipcount = self.chips[seat]
+            player.bet = self.bets[seat]
+            player.contributed = self.contributed[seat]
+            player.folded = self.folded[seat]
+            player.all_in = self.all_in[seat]
+            player.round_played = self.round_played[seat]
+            player.game_in_play = self.in_play[seat]
+            player.hand = [card for card in self.hands[2 * seat:2 * seat + 2] if card != no_card]
+            state = game.hand_states[player]
+            state.reset()
+            for card in player.hand:
+                state.add(card)
+
+        board = [card for card in self.board if card != no_card]
+        # Set directly rather than through insert_*, which report newly dealt streets
+        community_cards = game.community_cards
+        community_cards.reset()
+        if board:
+            community_cards.flopcards = game.flop_cards = board[:3]
+        if len(board) > 3:
+            community_cards.turncard = game.turn_card = board[3]
+        if len(board) > 4:
+            community_cards.rivercard = game.river_card = board[4]
+        for player in game.players:
+            if player.hand:
+                for card in board:
+                    game.hand_states[player].add(card)
+
+        game.pot = self.pot
+        game.betting_round_pot = self.betting_round_pot
+        game.dealer_index = self.dealer_index
+        game.small_blind_index = self.small_blind_index
+        game.big_blind_index = self.big_blind_index
+        game.active_player_index = self.active_player_index
+        game.deck.cards[:] = self.deck
+        game.deck.remaining = self.deck_remaining
+        game.deck.draws = []
+
+        street = self.street
+        game.players_dealt = any(player.hand for player in game.players)
+        game.flop_dealt, game.turn_dealt, game.river_dealt = street >= 1, street >= 2, street >= 3
+        game.game_state = game.game_states[street]
+        return game
@@ -1,6 +1,7 @@
 # table.py
 
 import game.config as cg
+from game.events import log, INFO, WARNING
 import numpy as np
 
 class Community_Cards:
@@ -14,40 +15,54 @@ class Community_Cards:
         self.turncard = None
         self.rivercard = None 
 
+    def cards(self):
+        '''
+        Returns the community cards dealt so far as a list.
+        '''
+        board = list(self.flopcards)
+        if self.turncard is not None:
+            board.append(self.turncard)
+        if self.rivercard is not None:
+            board.append(self.rivercard)
+        return board
+
     def insert_flop(self, flopcards):
         if not self.flopcards:
             self.flopcards = flopcards
+            if log.wants(INFO):
+                log.emit(INFO, "street", street="Flop", cards=list(flopcards))
         else:
-            print("Flop has already been inserted.")
+            log.emit(WARNING, "warning", message="Flop has already been inserted.")
 
     def insert_turn(self, turncard):
         if self.turncard is None:
             self.turncard = turncard
+            if log.wants(INFO):
+                log.emit(INFO, "street", street="Turn", cards=[turncard])
         else:
-            print("Turn card has already been inserted.")
+            log.emit(WARNING, "warning", message="Turn card has already been inserted.")
 
     def insert_river(self, rivercard):
         if self.rivercard is None:
             self.rivercard = rivercard
+            if log.wants(INFO):
+                log.emit(INFO, "street", street="River", cards=[rivercard])
         else:
-            print("River card has already been inserted.")
+            log.emit(WARNING, "warning", message="River card has already been inserted.")
 
     def reveal_flop(self):
-            print(f"Flop: {', '.join(map(str, self.flopcards))}")
             return self.flopcards
 
 
     def reveal_turn(self):
         if self.turncard is not None:
-            print("Turn:", str(self.turncard))
             return self.turncard
         else:
-            print("Turn card has already been revealed.")
+            log.emit(WARNING, "warning", message="Turn card has already been revealed.")
 
 
     def reveal_river(self):
         if self.rivercard is not None:
-            print("River:", str(self.rivercard))
             return self.rivercard
         else:
-            print("River card has already been revealed.")
+            log.emit(WARNING, "warning", message="River card has already been revealed.")
@@ -0,0 +1,234 @@
+# vector.py
+
+import numpy as np
+
+from game.cards import make_rng, deal_hands, deal_layout
+from game.evaluator import evaluate_batch
+import game.config as cg
+
+# Lockstep heads-up engine
+#
+# VectorEngine plays n heads-up tables at once with the GameLogic rules, as played by
+# game.runner.play_hand. Every field is an array with one row per table (and a column per seat),
+# and step(actions, amounts) applies one decision at every table in a handful of NumPy operations.
+# A table whose hand ends is paid out and dealt the next hand in the same call; a table where a
+# player busts starts a new game with fresh stacks, as GameLogic.end_game does.
+#
+# Seat 0 posts the small blind and seat 1 the big blind (GameLogic.blinds). The first seat to act
+# on every street is the table's active seat, which alternates between hands.
+#
+# Actions are ints: 0 check/call, 1 bet/raise by amounts[i] chips (bringing the bet to at least the
+# highest bet, at most all-in), 2 fold, as in game.actions.
+
+CHECK_CALL = 0
+BET_RAISE = 1
+FOLD = 2
+
+seats = 2
+layout = deal_layout(seats)
+hole_columns = layout['hole']
+board_columns = layout['board']
+
+class VectorEngine:
+    def __init__(self, n, rng=None, chipcount=cg.chipcount):
+        self.n = n
+        self.rng = make_rng(rng)
+        self.chipcount = chipcount
+        rows = np.arange(n)
+        self.rows = rows
+
+        self.chips = np.full((n, seats), chipcount, dtype=np.int64)
+        self.bets = np.zeros((n, seats), dtype=np.int64)
+        self.contributed = np.zeros((n, seats), dtype=np.int64)
+        self.folded = np.zeros((n, seats), dtype=bool)
+        self.all_in = np.zeros((n, seats), dtype=bool)
+        self.round_played = np.zeros((n, seats), dtype=bool)
+        self.pot = np.zeros(n, dtype=np.int64)
+        self.round_pot = np.zeros(n, dtype=np.int64)
+        self.street = np.zeros(n, dtype=np.int8)
+        self.cards = np.zeros((n, 2 * seats + 8), dtype=np.int8)
+        self.to_act = np.zeros(n, dtype=np.int8)
+
+        # GameLogic starts with the dealer on seat 0 and the active seat on 1
+        self.active = np.ones(n, dtype=np.int8)
+        self.hands_played = np.zeros(n, dtype=np.int64)
+
+    def reset(self, cards=None):
+        '''
+        Starts a new game at every table. cards, if given, is the (n, 12) deal_hands array to use.
+        '''
+        self.chips[:] = self.chipcount
+        self.active[:] = 1
+        self.hands_played[:] = 0
+        self._start_hands(self.rows, cards)
+        self._advance(np.zeros((self.n, seats), dtype=np.int64), np.zeros(self.n, dtype=bool))
+
+    def hole_cards(self):
+        '''
+        (n, seats, 2) hole cards.
+        '''
+        return self.cards[:, hole_columns]
+
+    def board(self):
+        '''
+        (n, 5) board cards; only the first 0, 3, 4 or 5 are dealt on streets 0-3.
+        '''
+        return self.cards[:, board_columns]
+
+    def legal_actions(self, menu):
+        '''
+        (mask, amounts) of a game.actions.BetMenu for the seat to act at every table, (n, menu.size) each.
+        '''
+        seat = self.to_act.astype(np.intp)
+        call = self.bets.max(axis=1) - self.bets[self.rows, seat]
+        return menu.options_batch(self.pot + self.round_pot, call, self.chips[self.rows, seat])
+
+    def step_menu(self, slots, menu, amounts=None):
+        '''
+        step() with one bet menu slot per table. amounts is the table from legal_actions, if at hand.
+        '''
+        slots = np.asarray(slots)
+        if amounts is None:
+            _, amounts = self.legal_actions(menu)
+        actions = np.where(slots == menu.fold_slot, FOLD, np.where(slots == menu.call_slot, CHECK_CALL, BET_RAISE))
+        return self.step(actions, amounts[self.rows, slots])
+
+    # Rules
+
+    def _start_hands(self, rows, cards=None):
+        if cards is None:
+            cards = deal_hands(len(rows), seats, self.rng)
+        self.cards[rows] = cards
+        self.bets[rows] = 0
+        self.contributed[rows] = 0
+        self.folded[rows] = False
+        self.all_in[rows] = False
+        self.round_played[rows] = False
+        self.pot[rows] = 0
+        self.round_pot[rows] = 0
+        self.street[rows] = 0
+
+        # Blinds go straight into the pot; a short stack is all-in for what it has
+        for seat, blind in ((0, cg.small_blind), (1, cg.big_blind)):
+            amount = np.minimum(blind, self.chips[rows, seat])
+            self.chips[rows, seat] -= amount
+            self.bets[rows, seat] += amount
+            self.contributed[rows, seat] += amount
+            self.pot[rows] += amount
+            self.all_in[rows, seat] = self.chips[rows, seat] == 0
+
+        # Pre-flop betting always runs, starting from the active seat if it can act
+        active = self.active[rows]
+        self.to_act[rows] = np.where(self._can_act(rows, active), active, 1 - active)
+        stuck = ~self._can_act(rows, self.to_act[rows])
+        self.to_act[rows[stuck]] = -1
+
+    def _can_act(self, rows, seat):
+        return ~self.folded[rows, seat] & ~self.all_in[rows, seat]
+
+    def _needs_action(self, rows, seat):
+        highest = self.bets[rows].max(axis=1)
+        return self._can_act(rows, seat) & (~self.round_played[rows, seat] | (self.bets[rows, seat] < highest))
+
+    def step(self, actions, amounts=None):
+        '''
+        Applies one action at every table. Returns (rewards, done): the (n, seats) net chips of the
+        hands that ended on this step (0 elsewhere) and which tables finished a hand.
+        '''
+        actions = np.asarray(actions)
+        rows = self.rows
+        seat = self.to_act.astype(np.intp)
+        highest = self.bets.max(axis=1)
+        bet = self.bets[rows, seat]
+        chips = self.chips[rows, seat]
+
+        amount = np.where(actions == CHECK_CALL, np.minimum(highest - bet, chips), 0)
+        raising = actions == BET_RAISE
+        if raising.any():
+            if amounts is None:
+                raise ValueError("Bet/raise actions need amounts")
+            raised = np.asarray(amounts)[raising]
+            if np.any(bet[raising] + raised < highest[raising]) or np.any(raised > chips[raising]):
+                raise ValueError("Invalid bet amount: a bet must reach the highest bet and fit the player's chips")
+            amount[raising] = raised
+        if np.any((actions < CHECK_CALL) | (actions > FOLD)):
+            raise ValueError("Actions must be 0 (check/call), 1 (bet/raise) or 2 (fold)")
+
+        self.folded[rows, seat] |= actions == FOLD
+        self.bets[rows, seat] += amount
+        self.contributed[rows, seat] += amount
+        self.chips[rows, seat] -= amount
+        self.round_pot += amount
+        self.all_in[rows, seat] |= self.chips[rows, seat] == 0
+        self.round_played[rows, seat] = True
+
+        # Next to act: the other seat if it still has to act, otherwise the betting round is over
+        other = 1 - seat
+        hand_over = self.folded.any(axis=1)
+        self.to_act = np.where(~hand_over & self._needs_action(rows, other), other, -1).astype(np.int8)
+
+        rewards = np.zeros((self.n, seats), dtype=np.int64)
+        done = np.zeros(self.n, dtype=bool)
+        self._advance(rewards, done)
+        return rewards, done
+
+    def _advance(self, rewards, done):
+        '''
+        Closes finished betting rounds, deals the next streets, pays out finished hands and starts
+        new ones, until every table is waiting for a player's action.
+        '''
+        while True:
+            rows = np.flatnonzero(self.to_act < 0)
+            if not len(rows):
+                return
+
+            # Collect the betting round into the pot
+            self.pot[rows] += self.round_pot[rows]
+            self.round_pot[rows] = 0
+            self.bets[rows] = 0
+            self.round_played[rows] = False
+
+            finished = self.folded[rows].any(axis=1) | (self.street[rows] == 3)
+            self._finish_hands(rows[finished], rewards, done)
+
+            # Next street: betting only when both players can still act
+            rows = rows[~finished]
+            self.street[rows] += 1
+            active = self.active[rows]
+            both = self._can_act(rows, 0) & self._can_act(rows, 1)
+            self.to_act[rows] = np.where(both, active, -1)
+
+    def _finish_hands(self, rows, rewards, done):
+        if not len(rows):
+            return
+        contributed = self.contributed[rows]
+        folded = self.folded[rows]
+        payouts = np.zeros((len(rows), seats), dtype=np.int64)
+
+        # A fold hands everything to the other player. At a showdown, uncalled chips go back to the
+        # bigger contributor and the matched pot to the best hand
+        by_fold = folded.any(axis=1)
+        total = contributed.sum(axis=1)
+        matched = contributed.min(axis=1)
+        bigger = contributed.argmax(axis=1)
+        payouts[np.arange(len(rows)), bigger] += np.where(by_fold, 0, contributed.max(axis=1) - matched)
+
+        hole = self.cards[rows][:, hole_columns]
+        board = self.cards[rows][:, board_columns]
+        first, _ = evaluate_batch(np.hstack([hole[:, 0], board]))
+        second, _ = evaluate_batch(np.hstack([hole[:, 1], board]))
+        tie = ~by_fold & (first == second)
+        payouts[:, 0] += np.where(by_fold, folded[:, 1] * total, np.where(first > second, 2 * matched, 0))
+        payouts[:, 1] += np.where(by_fold, folded[:, 0] * total, np.where(second > first, 2 * matched, 0))
+        payouts += np.where(tie, matched, 0)[:, None]
+
+        self.chips[rows] += payouts
+        rewards[rows] = payouts - contributed
+        done[rows] = True
+        self.hands_played[rows] += 1
+
+        # A bust ends the game: fresh stacks and positions, as GameLogic.end_game, before rotating
+        bust = (self.chips[rows] == 0).any(axis=1)
+        self.chips[rows[bust]] = self.chipcount
+        self.active[rows] = np.where(bust, 0, 1 - self.active[rows])
+        self._start_hands(rows)
@@ -7,9 +7,10 @@ import os
 import sys
 import re
 
-from game.game_logic import hand_evaluation, compare_scores, GameLogic
+from game.game_logic import compare_scores, GameLogic
+from game.events import log, ConsoleSink
 from game.player import Player
-from game.cards import Deck, change_card_str
+from game.cards import Deck, card_to_image
 import game.table as Tb
 import game.config as cg
 
@@ -44,6 +45,9 @@ class Game:
         self.is_running = True
         self.game = GameLogic()
 
+        # Table commentary on the console, as the players choose their actions there
+        log.add_sink(ConsoleSink())
+
 
     def load_card_images(self):
         img_suits = ['spades', 'hearts', 'diamonds', 'clubs']
@@ -137,10 +141,7 @@ class Game:
 
         for i, player in enumerate(self.game.players):
             for j, card in enumerate(player.hand):
-                rank, suit = change_card_str(player.hand[j])
-
-                file_name = f"{rank}_of_{suit}.png"
-                key = os.path.join("images", file_name)
+                key = card_to_image[card]
 
                 try:
                     card_image = pygame.image.load(key)
@@ -203,10 +204,7 @@ class Game:
             self.draw_card(self.game.community_cards.rivercard, self.river_x, self.community_container_y + 10, self.community_container_width, self.community_container_height)
 
     def draw_card(self, card, x, y, width, height):
-        rank, suit = change_card_str(card)
-
-        file_name = f"{rank}_of_{suit}.png"
-        key = os.path.join("images", file_name)
+        key = card_to_image[card]
 
         try:
             card_image = pygame.image.load(key)
@@ -223,9 +221,7 @@ class Game:
             # Start Round logic
             self.game.deal_hole_cards()
 
-            for player in self.game.players:
-                if player.game_in_play:
-                    hand_evaluation(player, player.hand, [])
+            self.game.evaluate_hands()
 
             self.draw_players_cards()
             pygame.display.flip()
@@ -239,9 +235,7 @@ class Game:
             # Deal Flop logic
             self.game.flop_dealt, self.flop_cards = self.game.flop()
 
-            for player in self.game.players:
-                if player.game_in_play:
-                    hand_evaluation(player, player.hand, self.flop_cards)
+            self.game.evaluate_hands()
 
             self.draw_flop_cards()
             self.manager.draw_ui(self.screen)
@@ -255,9 +249,7 @@ class Game:
             # Deal Turn logic
             self.game.turn_dealt, self.turn_card = self.game.turn()
 
-            for player in self.game.players:
-                if player.game_in_play:
-                    hand_evaluation(player, player.hand, self.flop_cards + [self.turn_card])
+            self.game.evaluate_hands()
 
             self.draw_turn_cards()
             pygame.display.flip()
@@ -270,9 +262,7 @@ class Game:
             # Deal River logic
             self.game.river_dealt, self.river_card = self.game.river()
 
-            for player in self.game.players:
-                if player.game_in_play:
-                    hand_evaluation(player, player.hand, self.flop_cards + [self.turn_card] + [self.river_card])
+            self.game.evaluate_hands()
 
             self.draw_river_cards()
             pygame.display.flip()
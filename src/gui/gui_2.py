@@ -6,8 +6,9 @@ import pygame_gui
 import os
 import sys
 
-from game.game_logic import hand_evaluation, GameLogic
-from game.cards import change_card_str
+from game.game_logic import GameLogic
+from game.events import log, ConsoleSink
+from game.cards import card_to_image
 
 
 rank_mapping = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, 'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
@@ -52,6 +53,9 @@ class Game:
         self.is_running = True
         self.game = GameLogic()
 
+        # Table commentary on the console, as the players choose their actions there
+        log.add_sink(ConsoleSink())
+
 
     def load_card_images(self):
         img_suits = ['spades', 'hearts', 'diamonds', 'clubs']
@@ -148,10 +152,7 @@ class Game:
 
         for i, player in enumerate(self.game.players):
             for j, card in enumerate(player.hand):
-                rank, suit = change_card_str(player.hand[j])
-
-                file_name = f"{rank}_of_{suit}.png"
-                key = os.path.join("images", file_name)
+                key = card_to_image[card]
 
                 try:
                     card_image = pygame.image.load(key)
@@ -217,10 +218,7 @@ class Game:
         self.draw_card(self.game.community_cards.rivercard, self.river_x, self.community_container_y + 27, self.community_container_width, self.community_container_height)
 
     def draw_card(self, card, x, y, width, height):
-        rank, suit = change_card_str(card)
-
-        file_name = f"{rank}_of_{suit}.png"
-        key = os.path.join("images", file_name)
+        key = card_to_image[card]
 
         try:
             card_image = pygame.image.load(key)
@@ -237,9 +235,7 @@ class Game:
             # Start Round logic
             self.game.deal_hole_cards()
 
-            for player in self.game.players:
-                if player.game_in_play:
-                    hand_evaluation(player, player.hand, [])
+            self.game.evaluate_hands()
 
             self.draw_players_cards()
             pygame.display.flip()
@@ -253,9 +249,7 @@ class Game:
             # Deal Flop logic
             self.game.flop_dealt, self.flop_cards = self.game.flop()
 
-            for player in self.game.players:
-                if player.game_in_play:
-                    hand_evaluation(player, player.hand, self.flop_cards)
+            self.game.evaluate_hands()
 
             self.draw_flop_cards()
             self.manager.draw_ui(self.screen)
@@ -269,9 +263,7 @@ class Game:
             # Deal Turn logic
             self.game.turn_dealt, self.turn_card = self.game.turn()
 
-            for player in self.game.players:
-                if player.game_in_play:
-                    hand_evaluation(player, player.hand, self.flop_cards + [self.turn_card])
+            self.game.evaluate_hands()
 
             self.draw_turn_cards()
             pygame.display.flip()
@@ -284,9 +276,7 @@ class Game:
             # Deal River logic
             self.game.river_dealt, self.river_card = self.game.river()
 
-            for player in self.game.players:
-                if player.game_in_play:
-                    hand_evaluation(player, player.hand, self.flop_cards + [self.turn_card] + [self.river_card])
+            self.game.evaluate_hands()
 
             self.draw_river_cards()
             pygame.display.flip()
@@ -0,0 +1,7 @@
+# conftest.py
+
+import os
+import sys
+
+# The game package lives in src/ and is imported as `game`, as main.py does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
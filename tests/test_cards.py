@@ -0,0 +1,35 @@
+# test_cards.py
+
+from game.actions import RandomProvider
+from game.cards import Deck
+from game.game_logic import GameLogic
+from game.runner import play_hand
+
+def test_reset_deck_deals_the_same_cards_from_the_same_generator_state():
+    deck = Deck(0)
+    for _ in range(3):
+        deck.reset()
+        [deck.deal_card() for _ in range(9)]
+    deck.reset()
+    state = deck.rng.bit_generator.state
+    first = [deck.deal_card() for _ in range(9)]
+    deck.reset()
+    deck.rng.bit_generator.state = state
+    assert [deck.deal_card() for _ in range(9)] == first
+
+def test_restoring_the_generator_replays_a_hand():
+    game = GameLogic(0, [RandomProvider(1), RandomProvider(2)])
+    for _ in range(3):
+        play_hand(game)
+
+    state = game.rng.bit_generator.state
+    game.deal_hole_cards()
+    first = [list(player.hand) for player in game.players]
+    for player in game.players:
+        player.reset_hand()
+        game.hand_states[player].reset()
+
+    game.rng.bit_generator.state = state
+    game.new_round()
+    game.deal_hole_cards()
+    assert [list(player.hand) for player in game.players] == first
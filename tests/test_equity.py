@@ -0,0 +1,31 @@
+# test_equity.py
+
+from itertools import combinations
+
+import pytest
+
+from game.cards import card_from_name, deck_size
+from game.equity import exact_equity
+from game.evaluator import evaluate
+
+def cards(*names):
+    return [card_from_name(name) for name in names]
+
+def test_exact_equity_on_the_river_matches_enumeration():
+    hole = cards("Ah", "Kd")
+    board = cards("2c", "7s", "Kh", "9d", "3h")
+    result = exact_equity(hole, board)
+
+    hero = evaluate(hole + board)[0]
+    deck = [card for card in range(deck_size) if card not in hole + board]
+    villains = [evaluate(list(combo) + board)[0] for combo in combinations(deck, 2)]
+    win = sum(hero > villain for villain in villains) / len(villains)
+    tie = sum(hero == villain for villain in villains) / len(villains)
+
+    assert result.samples == len(villains)
+    assert result.win == pytest.approx(win)
+    assert result.equity == pytest.approx(win + tie / 2)
+
+def test_exact_equity_on_the_river_with_the_nuts():
+    result = exact_equity(cards("Ah", "Kh"), cards("Qh", "Jh", "Th", "2c", "3d"))
+    assert result.equity == pytest.approx(1.0)
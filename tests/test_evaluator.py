@@ -0,0 +1,95 @@
+# test_evaluator.py
+
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from game.cards import deck_size
+from game.evaluator import evaluate, evaluate_batch, hand_types, hand_classes, HandState
+from game.game_logic import Hand
+
+def five_card_key(cards):
+    '''
+    (category, ranks in tiebreak order) of exactly five cards, worked out from scratch.
+    '''
+    counts = Counter(card // 4 + 2 for card in cards)
+    # Ranks by group size, then rank: quads before the kicker, trips before the pair, ...
+    ranks = tuple(rank for rank, count in sorted(counts.items(), key=lambda item: (item[1], item[0]), reverse=True)
+                  for _ in range(count))
+    flush = len({card % 4 for card in cards}) == 1
+    straight = len(counts) == 5 and ranks[0] - ranks[4] == 4
+    if ranks == (14, 5, 4, 3, 2):
+        straight, ranks = True, (5, 4, 3, 2, 14)
+
+    if straight and flush:
+        return (9 if ranks[0] == 14 else 8), ranks
+    shape = sorted(counts.values(), reverse=True)
+    if shape[0] == 4:
+        return 7, ranks
+    if shape[:2] == [3, 2]:
+        return 6, ranks
+    if flush:
+        return 5, ranks
+    if straight:
+        return 4, ranks
+    if shape[0] == 3:
+        return 3, ranks
+    if shape[:2] == [2, 2]:
+        return 2, ranks
+    return (1 if shape[0] == 2 else 0), ranks
+
+def best_key(cards):
+    return max(five_card_key(five) for five in combinations(cards, 5))
+
+def random_hands(size, count, seed=0):
+    rng = np.random.default_rng(seed + size)
+    return np.array([rng.choice(deck_size, size, replace=False) for _ in range(count)])
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_evaluate_matches_best_of_five_enumeration(size):
+    ranks = {}
+    for hand in random_hands(size, 2000).tolist():
+        key = best_key(hand)
+        rank, category = evaluate(hand)
+        assert 1 <= rank <= hand_classes
+        assert category == key[0], (hand, hand_types[category])
+        assert ranks.setdefault(key, rank) == rank
+
+    # Equal hands share a rank, and ranks order the hands as the enumeration does
+    keys = sorted(ranks)
+    assert len(set(ranks.values())) == len(keys)
+    assert all(ranks[low] < ranks[high] for low, high in zip(keys, keys[1:]))
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_evaluate_batch_matches_evaluate(size):
+    hands = random_hands(size, 3000)
+    ranks, categories = evaluate_batch(hands)
+    expected = [evaluate(hand) for hand in hands.tolist()]
+    assert ranks.tolist() == [rank for rank, _ in expected]
+    assert categories.tolist() == [category for _, category in expected]
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_hand_key_is_the_best_five_cards(size):
+    for hand in random_hands(size, 2000, seed=1).tolist():
+        assert Hand(hand[:2], hand[2:]).key() == best_key(hand)
+
+def test_hand_key_orders_hands_as_evaluate_does():
+    first, second = random_hands(7, 5000, seed=2), random_hands(7, 5000, seed=3)
+    for one, other in zip(first.tolist(), second.tolist()):
+        one_key, other_key = Hand(one, []).key(), Hand(other, []).key()
+        one_rank, other_rank = evaluate(one)[0], evaluate(other)[0]
+        assert (one_key > other_key) == (one_rank > other_rank)
+        assert (one_key == other_key) == (one_rank == other_rank)
+
+def test_hand_state_rank_follows_the_cards_added():
+    state = HandState()
+    for hand in random_hands(7, 2000, seed=4).tolist():
+        state.reset()
+        for count, card in enumerate(hand, 1):
+            state.add(card)
+            if count >= 5:
+                assert state.rank() == evaluate(hand[:count])[0]
+                assert state.category() == evaluate(hand[:count])[1]
+                assert state.best_hand() == best_key(hand[:count])
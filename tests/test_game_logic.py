@@ -0,0 +1,38 @@
+# test_game_logic.py
+
+from game.actions import CallbackProvider, CHECK_CALL
+from game.cards import card_from_name
+from game.evaluator import hand_classes
+from game.game_logic import GameLogic, hand_evaluation
+from game.runner import play_hand
+
+def test_to_act_index_is_the_seat_being_asked():
+    asked = []
+
+    def policy(game, player, highest_bet):
+        asked.append(game.players[game.to_act_index] is player)
+        mask, _ = game.legal_actions(game.players[game.to_act_index])
+        assert mask[game.bet_menu.call_slot]
+        return CHECK_CALL
+
+    game = GameLogic(0, [CallbackProvider(policy), CallbackProvider(policy)])
+    for _ in range(20):
+        play_hand(game)
+    assert asked and all(asked)
+    assert game.to_act_index is None
+
+def test_hand_strength_keeps_one_scale_on_every_street():
+    game = GameLogic(0, [CallbackProvider(lambda *_: CHECK_CALL) for _ in range(2)])
+    player = game.players[0]
+    player.hand = [card_from_name("Ah"), card_from_name("Kh")]
+    board = [card_from_name(name) for name in ("Qh", "Jh", "Th", "2c", "3d")]
+
+    strength, description = hand_evaluation(player, player.hand, [])
+    assert 0 < strength < 1 and player.hand_rank == 0
+    keys = set(description)
+
+    for size in (3, 4, 5):
+        strength, description = hand_evaluation(player, player.hand, board[:size])
+        assert strength == 1.0 and player.hand_strength == strength
+        assert player.hand_rank == description["rank"] == hand_classes
+        assert set(description) == keys
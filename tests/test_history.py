@@ -0,0 +1,61 @@
+# test_history.py
+
+import os
+
+import game.config as cg
+from game.history import HandHistoryWriter, HandHistoryReader
+from game.runner import play_match, random_providers
+
+def snapshot(results):
+    # Plain-list copy of a hand, as the table records every hand into one Results
+    return {
+        "players": list(results.players),
+        "hands": [list(cards) for cards in results.hands],
+        "board": list(results.community_cards),
+        "stacks": list(results.stacks),
+        "dealer": results.dealer,
+        "active": results.active,
+        "payouts": list(results.payouts),
+        "net": list(results.net),
+        "ranks": list(results.ranks),
+        "decisions": [list(decision) for decision in results.decisions],
+    }
+
+class Recorder:
+    '''
+    Writes hands to a HandHistoryWriter and keeps a copy of each.
+    '''
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.hands = []
+
+    def write(self, results):
+        self.writer.write(results)
+        self.hands.append(snapshot(results))
+
+def record(path, hands, seed, chunk_hands=100):
+    with HandHistoryWriter(path, cg.agents, chunk_hands=chunk_hands) as writer:
+        recorder = Recorder(writer)
+        play_match(random_providers(seed), hands, seed, history=recorder)
+    return recorder.hands
+
+def read(path):
+    with HandHistoryReader(path) as reader:
+        return [snapshot(results) for results in reader.results()]
+
+def test_history_round_trip(tmp_path):
+    path = tmp_path / "hands.rlph"
+    written = record(path, 250, 1)
+    written += record(path, 30, 2)
+    assert read(path) == written
+
+def test_append_after_a_torn_chunk_drops_it(tmp_path):
+    path = tmp_path / "hands.rlph"
+    written = record(path, 250, 1)
+    os.truncate(path, os.path.getsize(path) - 10)
+
+    written = written[:200] + record(path, 100, 2)
+    with HandHistoryReader(path) as reader:
+        assert len(reader) == 300 and len(reader.chunks) == 3
+    assert read(path) == written
@@ -0,0 +1,16 @@
+# test_isomorphism.py
+
+import numpy as np
+import pytest
+
+from game.isomorphism import indexers
+
+@pytest.mark.parametrize("board_size", sorted(indexers))
+def test_unindex_batch_matches_unindex(board_size):
+    indexer = indexers[board_size]
+    indices = np.random.default_rng(board_size).integers(0, indexer.size, 500)
+    indices = np.concatenate([indices, [0, indexer.size - 1], indexer.offsets])
+
+    cards = indexer.unindex_batch(indices)
+    assert cards.tolist() == [indexer.unindex(int(index)) for index in indices]
+    assert (indexer.index_batch(cards) == indices).all()
@@ -0,0 +1,40 @@
+# test_showdown.py
+
+from game.showdown import side_pots, award
+
+def test_uncontested_pot_goes_to_the_player_yet_to_act():
+    # Both blinds fold to a player who never put anything in
+    pots = side_pots([0, 1, 2, 0, 0, 0], [True, False, False, False, False, False])
+    assert pots == [(3, [0])]
+    assert award(pots, [1, None, None, None, None, None]) == [3, 0, 0, 0, 0, 0]
+
+def test_single_live_seat_takes_everything():
+    pots = side_pots([10, 4, 2], [True, False, False])
+    assert sum(amount for amount, _ in pots) == 16
+    assert award(pots, [5, None, None]) == [16, 0, 0]
+
+def test_folded_seat_that_put_in_more_feeds_the_last_pot():
+    # Seat 2 raised to 50 and folded to seat 0's all-in for 20; seat 1 called 20
+    pots = side_pots([20, 20, 50], [True, True, False])
+    assert pots == [(90, [0, 1])]
+    assert award(pots, [7, 3, None]) == [90, 0, 0]
+
+def test_multiway_all_in_builds_side_pots():
+    pots = side_pots([10, 30, 60, 60], [True, True, True, True])
+    assert pots == [(40, [0, 1, 2, 3]), (60, [1, 2, 3]), (60, [2, 3])]
+    # The short stack has the best hand, the biggest stack the worst
+    assert award(pots, [4, 3, 2, 1]) == [40, 60, 60, 0]
+    assert award(pots, [1, 2, 3, 4]) == [0, 0, 0, 160]
+
+def test_odd_chip_goes_to_first_winner_left_of_first_seat():
+    pots = side_pots([5, 5, 1], [True, True, False])
+    assert pots == [(11, [0, 1])]
+    assert award(pots, [2, 2, None], first_seat=1) == [5, 6, 0]
+    assert award(pots, [2, 2, None], first_seat=0) == [6, 5, 0]
+
+def test_chips_are_conserved():
+    contributions = [0, 7, 25, 25, 3, 40]
+    in_hand = [True, False, True, True, False, False]
+    pots = side_pots(contributions, in_hand)
+    assert sum(amount for amount, _ in pots) == sum(contributions)
+    assert sum(award(pots, [1, None, 1, 1, None, None], first_seat=2)) == sum(contributions)